@@ -0,0 +1,572 @@
+import io
+import os
+import glob
+import shutil
+import re
+import copy
+import json
+import time
+import tempfile
+import unittest
+import tracemalloc
+import contextlib
+import tt
+from tt.controller.parser import TextParser, Parser
+from tt.controller.compositor import Compositor, TemplateRule
+from tt.controller.serializer import JsonSerializer, MarshalSerializer
+from tt.model.regex import Regex
+from tt.model.templates import Templates
+from tt.model.filecache import FileCache
+from tt.model.parsingtree import ParsingTree
+from tt.model.taggedpieces import TaggedPieces
+from tt.model.joinedcontent import JoinedContent
+from tt.model.taggedtexts import TaggedTexts
+
+
+def _measure_best_time(function, *args, repeat: int = 3):
+    """Get the best elapsed time in seconds of some runs of a function.
+
+    :param function: the function to measure.
+    :param args: the arguments of the function.
+    :param repeat: the number of runs.
+    :return: the best elapsed time in seconds.
+    """
+    best_time = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        elapsed_time = time.perf_counter() - start
+        if best_time is None or elapsed_time < best_time:
+            best_time = elapsed_time
+
+    return best_time
+
+
+def _generate_paragraph_lines(number_of_paragraphs: int):
+    """Generate the text lines of a tt file with many short paragraphs.
+
+    :param number_of_paragraphs: the number of paragraphs.
+    :return: a generator of the text lines.
+    """
+    for i in range(number_of_paragraphs):
+        yield '#paragraph\n'
+        yield f"The paragraph number {i} with /*bold*/some*/ text and a #A# marker.\n"
+        yield '\n'
+
+
+def _append_pieces_with_three_escape_passes(pieces: list):
+    """Append the pieces to a parsing tree removing the escape chars of the special chars with a regex substitution for
+    each special char, as a reference for the single pass.
+
+    :param pieces: the text pieces to append.
+    """
+    parsing_tree = ParsingTree()
+    for piece in pieces:
+        piece = parsing_tree.strip_escape_char_from_beginning_and_end_of_piece(piece)
+        piece = re.sub(r'\\(?=' + Regex.open_inline_tag + ')', '', piece)
+        piece = re.sub(r'\\(?=' + Regex.hashtag_no_value + ')', '', piece)
+        piece = re.sub(r'\\(?=' + Regex.hashtag_id + ')', '', piece)
+        # The piece is already processed, so an empty list of IDs is appended in its place to not process it again
+        parsing_tree.append_tagged_piece([], '')
+
+
+def _append_pieces(pieces: list):
+    """Append the pieces to a parsing tree.
+
+    :param pieces: the text pieces to append.
+    """
+    parsing_tree = ParsingTree()
+    for piece in pieces:
+        parsing_tree.append_tagged_piece(piece, '')
+
+
+def _prepare_layered_templates(number_of_templates: int, number_of_tags: int):
+    """Prepare some templates where each one has a rule, and sometimes a tag list rule, for a part of the tags.
+
+    :param number_of_templates: the number of templates.
+    :param number_of_tags: the number of tags.
+    :return: the template names and the tags.
+    """
+    Templates.reset()
+    template_names = [f"template {i}" for i in range(number_of_templates)]
+    tags = [f"tag{i}" for i in range(number_of_tags)]
+    for template_index, template_name in enumerate(template_names):
+        Templates.initialize(template_name)
+        rules = []
+        for tag_index, tag in enumerate(tags):
+            if tag_index % number_of_templates >= template_index:
+                Templates.set_trigger(tag, len(rules), template_name)
+                rules.append([[], 'tag'])
+            if tag_index % 5 == template_index:
+                Templates.set_trigger('_list_' + tag, len(rules), template_name)
+                rules.append([[], 'tag-list'])
+        Templates.set_rules(rules, template_name)
+
+    return template_names, tags
+
+
+def _look_for_rules_in_each_template(tags: list, template_names: list):
+    """Look for the rule and the tag list rule of each tag probing the triggers of every template, as a reference for
+    the resolved rules.
+
+    :param tags: the tags to look for.
+    :param template_names: the list of template names.
+    :return: the list of the found rules and tag list rules.
+    """
+    found_rules = []
+    for tag in tags:
+        found_rule = found_list_rule = None
+        for template_name in reversed(template_names):
+            if tag in Templates.get_triggers(template_name):
+                found_rule = TemplateRule(Templates.get_rule_index(template_name, tag), template_name)
+            if '_list_' + tag in Templates.get_triggers(template_name):
+                found_list_rule = TemplateRule(Templates.get_rule_index(template_name, '_list_' + tag), template_name)
+        found_rules.append((found_rule, found_list_rule))
+
+    return found_rules
+
+
+def _look_for_resolved_rules(tags: list, template_names: list):
+    """Look for the rule and the tag list rule of each tag in the rules resolved for the template list.
+
+    :param tags: the tags to look for.
+    :param template_names: the list of template names.
+    :return: the list of the found rules and tag list rules.
+    """
+    return [Compositor.get_resolved_rules(template_names).get(tag, (None, None)) for tag in tags]
+
+
+def _read_file_each_time(file_abs_path: str, number_of_readings: int):
+    """Read the text of a file from the disk at each inclusion, as a reference for the file cache.
+
+    :param file_abs_path: the absolute path of the file.
+    :param number_of_readings: the number of inclusions of the file.
+    """
+    for _ in range(number_of_readings):
+        with open(file_abs_path, 'r', encoding='utf-8') as f:
+            ''.join(f.readlines())
+
+
+def _read_file_through_cache(file_abs_path: str, number_of_readings: int):
+    """Get the text of a file from a file cache at each inclusion.
+
+    :param file_abs_path: the absolute path of the file.
+    :param number_of_readings: the number of inclusions of the file.
+    """
+    file_cache = FileCache()
+    for _ in range(number_of_readings):
+        file_cache.get_text(file_abs_path)
+
+
+def _get_raw_value_by_concatenation(content_data, piece_value):
+    """Get the raw value of a piece concatenating the values of its sub pieces at each call, as a reference for the
+    cached raw values.
+
+    :param content_data: the content data of the piece.
+    :param piece_value: the value of the piece.
+    :return: the raw value of the piece.
+    """
+    value = ''
+    if type(piece_value) is list:
+        for sub_piece_id in piece_value:
+            sub_piece_value = content_data[sub_piece_id][0]
+            if type(sub_piece_value) is list:
+                value += _get_raw_value_by_concatenation(content_data, sub_piece_value)
+            else:
+                value += sub_piece_value
+    else:
+        value += piece_value
+
+    return value
+
+
+def _get_raw_values_by_concatenation(content_data, piece_ids: list):
+    """Get the raw value of some pieces concatenating the values of their sub pieces.
+
+    :param content_data: the content data of the pieces.
+    :param piece_ids: the IDs of the pieces.
+    """
+    for piece_id in piece_ids:
+        _get_raw_value_by_concatenation(content_data, content_data[piece_id][0])
+
+
+def _get_cached_raw_values(content_data, piece_ids: list):
+    """Get the raw value of some pieces from the cached raw values of their content data.
+
+    :param content_data: the content data of the pieces.
+    :param piece_ids: the IDs of the pieces.
+    """
+    for piece_id in piece_ids:
+        TaggedTexts.get_raw_value(content_data, piece_id)
+
+
+def _join_by_copy(pieces_list: list):
+    """Join some lists of pieces copying them and shifting the child IDs of each one, as the content list was joined.
+
+    :param pieces_list: the lists of pieces to join.
+    :return: the joined list of pieces.
+    """
+    joined_pieces = []
+    for pieces in pieces_list:
+        pieces = copy.deepcopy(pieces)
+        for piece in pieces:
+            if type(piece[0]) is list:
+                piece[0] = [piece_id + len(joined_pieces) for piece_id in piece[0]]
+        joined_pieces += pieces
+
+    return joined_pieces
+
+
+def _write_project(project_abs_folder: str, template_text: str, content_lines):
+    """Write a spine that publishes a content with a template.
+
+    :param project_abs_folder: the absolute folder of the project.
+    :param template_text: the text of the template.
+    :param content_lines: an iterable of the text lines of the content.
+    :return: the absolute path of the spine.
+    """
+    os.makedirs(os.path.join(project_abs_folder, 'template'))
+    with open(os.path.join(project_abs_folder, 'spine.tt'), 'w', encoding='utf-8') as f:
+        f.write(
+            '#template-path template\n#publication-path pub\n\n'
+            '#publish bench.html\n##content sample\n##template style\n'
+        )
+    with open(os.path.join(project_abs_folder, 'template', 'style.tt'), 'w', encoding='utf-8') as f:
+        f.write(template_text)
+    with open(os.path.join(project_abs_folder, 'sample.tt'), 'w', encoding='utf-8') as f:
+        f.writelines(content_lines)
+
+    return os.path.join(project_abs_folder, 'spine.tt')
+
+
+def _write_tag_list_project(project_abs_folder: str, number_of_items: int):
+    """Write a project with a tag list rule and a content with a single long list of items.
+
+    :param project_abs_folder: the absolute folder of the project.
+    :param number_of_items: the number of items of the list.
+    :return: the absolute path of the spine.
+    """
+    template_text = (
+        '#tag-list item\n##list\n    ###text <ul>\n    ###content\n    ###text </ul>\n##item-separator\n'
+        '    ###new-line\n##item\n    ###text <li>\n    ###content\n    ###text </li>\n\n#tag item\n##content\n'
+    )
+    content_lines = ['#title\nA long list\n\n'] + [f"#item The item number {i}\n" for i in range(number_of_items)]
+
+    return _write_project(project_abs_folder, template_text, content_lines)
+
+
+def _write_from_next_tag_project(project_abs_folder: str, number_of_paragraphs: int):
+    """Write a project where the file opening and every paragraph take a value from a tag at the end of the content.
+
+    :param project_abs_folder: the absolute folder of the project.
+    :param number_of_paragraphs: the number of paragraphs.
+    :return: the absolute path of the spine.
+    """
+    template_text = (
+        '#file-opening\n##text <h1>\n##from-next-tag title\n##text </h1>\n\n'
+        '#tag paragraph\n##text <p>\n##content\n##from-next-tag note\n##text </p>\n##new-line\n\n'
+        '#tag closing\n##content\n'
+    )
+    content_lines = [f"#paragraph\nThe paragraph number {i}\n\n" for i in range(number_of_paragraphs)]
+    content_lines += ['#closing\n##note The end\n\n#title\nA title\n']
+
+    return _write_project(project_abs_folder, template_text, content_lines)
+
+
+def _copy_scaled_fixture(fixture_rel_folder: str, project_abs_folder: str, scale: int):
+    """Copy a test fixture repeating the text of its content files, so the same templates are applied many times.
+
+    :param fixture_rel_folder: the folder of the fixture.
+    :param project_abs_folder: the absolute folder of the copy.
+    :param scale: the number of repetitions of the content.
+    :return: the absolute path of the spine of the copy.
+    """
+    shutil.copytree(
+        fixture_rel_folder, project_abs_folder, ignore=shutil.ignore_patterns('json', 'json-check', 'pub', 'pub-check')
+    )
+    for content_abs_path in glob.glob(os.path.join(project_abs_folder, '*.tt')):
+        if os.path.basename(content_abs_path) != 'spine.tt':
+            with open(content_abs_path, encoding='utf-8') as f:
+                text = f.read()
+            with open(content_abs_path, 'w', encoding='utf-8') as f:
+                f.write((text.rstrip('\n') + '\n\n') * scale)
+
+    return os.path.join(project_abs_folder, 'spine.tt')
+
+
+def _write_publication_silently(spine_abs_path: str):
+    """Write the publication of a spine without printing the report.
+
+    :param spine_abs_path: the absolute path of the spine.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        tt.write_publication_with_spine(spine_abs_path)
+
+
+class Benchmark(unittest.TestCase):
+
+    def setUp(self):
+        bench_id = self._testMethodName[5:]
+        print('\nBENCH:', bench_id)
+
+    def _assert_linear_growth(self, sizes: list, times: list):
+        """Check that the time grows at most about linearly with the size: a quadratic growth would multiply the time
+        by the square of the size ratio.
+
+        :param sizes: the increasing sizes of the input.
+        :param times: the elapsed times related to the sizes.
+        """
+        for size, elapsed_time in zip(sizes, times):
+            print(f"{size:>8} items: {elapsed_time * 1000:9.2f} ms")
+
+        size_ratio = sizes[-1] / sizes[0]
+        time_ratio = times[-1] / times[0]
+        print(f"size ratio {size_ratio:.0f}, time ratio {time_ratio:.1f}")
+        self.assertLess(time_ratio, size_ratio * 2.5)
+
+    def test_multi_text_lines_block(self):
+        sizes = [5000, 10000, 20000, 40000, 80000]
+        times = []
+        for size in sizes:
+            lines = ['#paragraph\n']
+            lines += [f"This is the line number {i} of a long block of text without tags.\n" for i in range(size)]
+            times.append(_measure_best_time(TextParser().parse, lines))
+
+        self._assert_linear_growth(sizes, times)
+
+    def test_line_with_many_inline_tags(self):
+        sizes = [1000, 2000, 4000, 8000]
+        times = []
+        for size in sizes:
+            line = ' '.join(f"word {i} /*note*/a /*bold*/nested*/ note*/" for i in range(size))
+            times.append(_measure_best_time(TextParser().parse, ['#paragraph\n', line + '\n']))
+
+        self._assert_linear_growth(sizes, times)
+
+    def test_line_with_many_hashtags_without_value(self):
+        sizes = [2000, 4000, 8000, 16000, 32000]
+        times = []
+        for size in sizes:
+            line = 'note #A##B##C#' * (size // 3)
+            times.append(_measure_best_time(TextParser().parse, ['#paragraph\n', line + '\n']))
+
+        self._assert_linear_growth(sizes, times)
+
+    def test_streaming_parse_memory(self):
+        sizes = [2000, 8000]
+        whole_peaks = []
+        streaming_peaks = []
+        for size in sizes:
+            tracemalloc.start()
+            for _ in TextParser.iterate_parsed_pieces(_generate_paragraph_lines(size)):
+                pass
+            streaming_peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+            lines = list(_generate_paragraph_lines(size))
+            tracemalloc.start()
+            TextParser().parse(lines)
+            whole_peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        for size, whole_peak, streaming_peak in zip(sizes, whole_peaks, streaming_peaks):
+            print(
+                f"{size:>8} blocks: whole parse {whole_peak / 1024:9.0f} KiB, "
+                f"streaming {streaming_peak / 1024:9.0f} KiB"
+            )
+
+        self.assertGreater(whole_peaks[-1] / whole_peaks[0], 2)
+        self.assertLess(streaming_peaks[-1] / streaming_peaks[0], 1.5)
+
+    def test_load_of_cache_formats(self):
+        parsed_data = TextParser().parse(list(_generate_paragraph_lines(50000))).get_json_data()
+        load_times = {}
+        with tempfile.TemporaryDirectory() as temp_abs_folder:
+            for serializer in [JsonSerializer, MarshalSerializer]:
+                file_abs_path = os.path.join(temp_abs_folder, 'bench.' + serializer.file_ext)
+                serializer.save([list(item) for item in parsed_data], file_abs_path)
+                load_times[serializer.cache_format] = _measure_best_time(serializer.load, file_abs_path)
+                file_size = os.path.getsize(file_abs_path)
+                print(
+                    f"{serializer.cache_format:>8}: {file_size / 1024:9.0f} KiB, "
+                    f"load {load_times[serializer.cache_format] * 1000:9.2f} ms"
+                )
+
+        self.assertLess(load_times['ttb'], load_times['json'])
+
+    def test_json_writing_throughput(self):
+        parsed_data = TextParser().parse(list(_generate_paragraph_lines(50000))).get_json_data()
+        normalized_data = [[value, tag] for value, tag in JsonSerializer.iterate_normalized_pieces(parsed_data)]
+        with tempfile.TemporaryDirectory() as temp_abs_folder:
+            file_abs_path = os.path.join(temp_abs_folder, 'bench.json')
+            write_time = _measure_best_time(JsonSerializer.write, normalized_data, file_abs_path)
+            file_size = os.path.getsize(file_abs_path)
+
+            def dump_with_json_module():
+                with open(file_abs_path, 'w', encoding='utf-8') as json_file_stream:
+                    json.dump(normalized_data, json_file_stream, ensure_ascii=False)
+
+            dump_time = _measure_best_time(dump_with_json_module)
+
+        print(f"{len(normalized_data):>8} pieces, {file_size / 1024:9.0f} KiB")
+        print(f"emitter: {file_size / write_time / 1e6:7.1f} MB/s, json.dump: {file_size / dump_time / 1e6:7.1f} MB/s")
+        self.assertLess(write_time, dump_time)
+
+    def test_tagged_pieces_memory(self):
+        parsed_data = TextParser().parse(list(_generate_paragraph_lines(125000))).get_json_data()
+        json_text = json.dumps([[value, tag] for value, tag in JsonSerializer.iterate_normalized_pieces(parsed_data)])
+        del parsed_data
+
+        tracemalloc.start()
+        pieces_list = json.loads(json_text)
+        list_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        number_of_pieces = len(pieces_list)
+        del pieces_list
+
+        tracemalloc.start()
+        tagged_pieces = TaggedPieces.from_pieces(json.loads(json_text))
+        tagged_pieces_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        self.assertEqual(number_of_pieces, len(tagged_pieces))
+        print(f"{number_of_pieces:>8} pieces")
+        print(
+            f"list of lists: {list_size / 1024 ** 2:7.1f} MiB, "
+            f"tagged pieces: {tagged_pieces_size / 1024 ** 2:7.1f} MiB"
+        )
+        self.assertLess(tagged_pieces_size, list_size / 2)
+
+    def test_escape_chars_of_pieces(self):
+        with open('tests/escape_char_all_cases/sample.tt', encoding='utf-8') as tt_file_stream:
+            pieces = [line.strip() for line in tt_file_stream] * 10000
+
+        reference_time = _measure_best_time(_append_pieces_with_three_escape_passes, pieces)
+        single_pass_time = _measure_best_time(_append_pieces, pieces)
+        print(f"{len(pieces):>8} pieces")
+        print(f"three passes: {reference_time * 1000:9.2f} ms, single pass: {single_pass_time * 1000:9.2f} ms")
+        self.assertLess(single_pass_time, reference_time)
+
+    def test_tag_list_with_many_items(self):
+        sizes = [1000, 10000, 100000]
+        times = []
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as temp_abs_folder:
+                spine_abs_path = _write_tag_list_project(temp_abs_folder, size)
+                times.append(_measure_best_time(_write_publication_silently, spine_abs_path, repeat=1))
+
+        self._assert_linear_growth(sizes, times)
+
+    def test_from_next_tag_in_many_tags(self):
+        sizes = [1000, 10000, 100000]
+        times = []
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as temp_abs_folder:
+                spine_abs_path = _write_from_next_tag_project(temp_abs_folder, size)
+                times.append(_measure_best_time(_write_publication_silently, spine_abs_path, repeat=1))
+
+        self._assert_linear_growth(sizes, times)
+
+    def test_rule_lookup_with_layered_templates(self):
+        template_names, tags = _prepare_layered_templates(12, 100)
+        looked_up_tags = tags * 2000
+
+        def get_sources(found_rules):
+            return [
+                [(rule.get_template_name(), rule.get_tag_rule_index()) if rule else None for rule in rules]
+                for rules in found_rules
+            ]
+
+        self.assertEqual(
+            get_sources(_look_for_rules_in_each_template(tags, template_names)),
+            get_sources(_look_for_resolved_rules(tags, template_names))
+        )
+        reference_time = _measure_best_time(_look_for_rules_in_each_template, looked_up_tags, template_names)
+        resolved_time = _measure_best_time(_look_for_resolved_rules, looked_up_tags, template_names)
+        Templates.reset()
+
+        print(f"{len(looked_up_tags):>8} lookups in {len(template_names)} templates")
+        print(f"each template: {reference_time * 1000:9.2f} ms, resolved rules: {resolved_time * 1000:9.2f} ms")
+        self.assertLess(resolved_time, reference_time)
+
+    def test_tag_rules_on_scaled_fixtures(self):
+        fixture_rel_folders = [
+            'tests/tag_list_full', 'tests/tt_object_rule_from_var', 'tests/tt_object_rule_new_line_space',
+            'tests/tt_object_rule_text_content_from_subtag', 'tests/tt_object_rule_from_next_tag_usable',
+            'tests/tt_object_rule_from_file'
+        ]
+        sizes = [500, 1000, 2000]
+        total_times = [0] * len(sizes)
+        for fixture_rel_folder in fixture_rel_folders:
+            times = []
+            for size in sizes:
+                with tempfile.TemporaryDirectory() as temp_abs_folder:
+                    spine_abs_path = _copy_scaled_fixture(
+                        fixture_rel_folder, os.path.join(temp_abs_folder, 'fixture'), size
+                    )
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        Parser.parse_spine_and_all_required_files(spine_abs_path)
+                        times.append(_measure_best_time(Compositor.apply_templates))
+
+            print(f"{os.path.basename(fixture_rel_folder):>46}: {times[-1] * 1000:9.2f} ms with {sizes[-1]} copies")
+            total_times = [total_time + elapsed_time for total_time, elapsed_time in zip(total_times, times)]
+
+        self._assert_linear_growth(sizes, total_times)
+
+    def test_from_file_inclusion(self):
+        with tempfile.TemporaryDirectory() as temp_abs_folder:
+            file_abs_path = os.path.join(temp_abs_folder, 'icon.svg')
+            with open(file_abs_path, 'w', encoding='utf-8') as f:
+                f.writelines(f'<path d="M {i} {i} L {i + 1} {i + 1}"/>\n' for i in range(1000))
+
+            file_size = os.path.getsize(file_abs_path)
+            reference_time = _measure_best_time(_read_file_each_time, file_abs_path, 5000)
+            cached_time = _measure_best_time(_read_file_through_cache, file_abs_path, 5000)
+
+        print(f"{5000:>8} inclusions of {file_size / 1024:.0f} KiB")
+        print(f"read each time: {reference_time * 1000:9.2f} ms, file cache: {cached_time * 1000:9.2f} ms")
+        self.assertLess(cached_time, reference_time)
+
+    def test_raw_values_of_pieces(self):
+        lines = ['#paragraph\n']
+        lines += [f"Word {i} /*note*/a /*bold*/nested*/ note*/ and /*bold*/text*/.\n" for i in range(2000)]
+        tagged_pieces = TaggedPieces.from_pieces(
+            JsonSerializer.iterate_normalized_pieces(TextParser().parse(lines).get_json_data())
+        )
+        piece_ids = [piece_id for piece_id in range(len(tagged_pieces)) if tagged_pieces.get_tag(piece_id)] * 10
+
+        self.assertEqual(
+            [_get_raw_value_by_concatenation(tagged_pieces, tagged_pieces[piece_id][0]) for piece_id in piece_ids],
+            [TaggedTexts.get_raw_value(tagged_pieces, piece_id) for piece_id in piece_ids]
+        )
+        reference_time = _measure_best_time(_get_raw_values_by_concatenation, tagged_pieces, piece_ids)
+        cached_time = _measure_best_time(_get_cached_raw_values, tagged_pieces, piece_ids)
+
+        print(f"{len(piece_ids):>8} raw values")
+        print(f"concatenation: {reference_time * 1000:9.2f} ms, cached raw values: {cached_time * 1000:9.2f} ms")
+        self.assertLess(cached_time, reference_time)
+
+    def test_joined_content_of_many_files(self):
+        parsed_data = TextParser().parse(list(_generate_paragraph_lines(2000))).get_json_data()
+        pieces = [[value, tag] for value, tag in JsonSerializer.iterate_normalized_pieces(parsed_data)]
+        pieces_list = [pieces] * 20
+        tagged_pieces_list = [TaggedPieces.from_pieces(pieces)] * 20
+
+        tracemalloc.start()
+        copied_pieces = _join_by_copy(pieces_list)
+        copy_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        joined_content = JoinedContent(tagged_pieces_list)
+        view_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        self.assertEqual(copied_pieces, list(joined_content))
+        print(f"{len(joined_content):>8} pieces in {len(pieces_list)} files")
+        print(f"deep copy: {copy_size / 1024 ** 2:7.1f} MiB, joined content: {view_size / 1024:7.1f} KiB")
+        self.assertLess(view_size, copy_size / 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
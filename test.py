@@ -1,8 +1,24 @@
+import io
+import os
+import glob
+import shutil
+import tempfile
+import contextlib
 import unittest
+from unittest import mock
 import tt
+import tt.__main__ as tt_cli
 from tests._tester import *
 from tests._tester.main import _empty_folder
 from tt.controller.exceptions import *
+from tt.controller.parser import TextParser, _Reader
+from tt.controller.serializer import JsonSerializer, MarshalSerializer
+from tt.model.parsingtree import ParsingTree
+from tt.model.taggedpieces import TaggedPieces
+from tt.model.joinedcontent import JoinedContent
+from tt.model.taggedtexts import TaggedTexts
+from tt.model.templates import Templates
+from tt.model.filecache import FileCache
 
 
 class E2E(unittest.TestCase):
@@ -159,16 +175,449 @@ class E2E(unittest.TestCase):
         self._launch_standard_e2e_test()
 
 
-#class Functional(unittest.TestCase):
+class Functional(unittest.TestCase):
 
-#    def run(self, result=None):
-#        TODO future development
-#        super().run(result)
+    def setUp(self):
+        test_id = self._testMethodName[5:]
+        print('\nTEST:', test_id)
+
+    def _given_publish_list_test_folder(self):
+        Paths.set_test_rel_folder('tests/base_spine_publish_list_content_list')
+        Paths.set_test_file_list(['spine.tt', 'chapter 1.tt', 'chapter 2.tt', 'chapter 3.tt', 'template/style.tt'])
+        check_test_assets_existence(self)
+        empty_json_and_pub_folders()
+
+    def _when_write_publication_with_spine_capturing_output(self, jobs):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            tt.write_publication_with_spine(Paths.get_spine_rel_path(), jobs)
+        return output.getvalue()
+
+    def test_parallel_parsing_with_jobs(self):
+        # given
+        self._given_publish_list_test_folder()
+        sequential_output = self._when_write_publication_with_spine_capturing_output(jobs=1)
+        empty_json_and_pub_folders()
+
+        # when
+        parallel_output = self._when_write_publication_with_spine_capturing_output(jobs=3)
+
+        # then
+        check_json_files_are_equal_to_expected_json_files(self)
+        check_pub_files_are_equal_to_expected_pub_files(self)
+        self.assertEqual(sequential_output, parallel_output)
 
-#    def test_0001(self):
+    def test_segmented_parsing_of_tt_files(self):
         # given
+        tt_file_paths = sorted(glob.glob('tests/*/*.tt') + glob.glob('tests/*/template/*.tt'))
+        line_lists = []
+        for tt_file_path in tt_file_paths:
+            with open(tt_file_path, encoding='utf-8') as tt_file_stream:
+                line_lists.append(tt_file_stream.readlines())
+        all_lines = [line for lines in line_lists for line in lines]
+
+        for lines in [all_lines] + line_lists:
+            # when
+            expected_data = TextParser().parse(lines).get_json_data()
+            merged_tree = ParsingTree()
+            segment_ranges = TextParser.get_segment_ranges(lines, 0)
+            for start, end in segment_ranges:
+                merged_tree.append_parsed_data(TextParser('', start).parse(lines[start:end]).get_json_data())
+
+            # then
+            self.assertEqual(expected_data, merged_tree.get_json_data())
+            for lines_per_segment in [0, 5]:
+                token_segments = TextParser.iterate_segments(lines, lines_per_segment)
+                self.assertEqual(
+                    [(start, start + len(tokens)) for start, tokens in token_segments],
+                    TextParser.get_segment_ranges(lines, lines_per_segment)
+                )
+
+        self.assertGreater(len(TextParser.get_segment_ranges(all_lines, 0)), 100)
+
+    def test_text_parsers_do_not_share_state(self):
+        # given
+        test_folders = ['tests/double_new_line_all_cases', 'tests/escape_char_all_cases']
+        line_lists = []
+        expected_data_list = []
+        for test_folder in test_folders:
+            with open(os.path.join(test_folder, 'sample.tt'), encoding='utf-8') as tt_file_stream:
+                line_lists.append(tt_file_stream.readlines())
+            expected_data_list.append(JsonSerializer.load(os.path.join(test_folder, 'json-check', 'sample.json')))
+
+        def normalize(parsed_data):
+            return [[value, tag] for value, tag in JsonSerializer.iterate_normalized_pieces(parsed_data)]
+
         # when
+        empty_lines_data = TextParser().parse(['#p a\n', 'b\n', '\n', '\n', '\n', 'c\n']).get_json_data()
+        text_parser = TextParser()
+        first_parsing_tree = text_parser.parse(line_lists[0])
+        second_parsed_data = text_parser.parse(line_lists[1]).get_json_data()
+        first_parsed_data = first_parsing_tree.get_json_data()
+        third_parsed_data = text_parser.parse(line_lists[0]).get_json_data()
+
+        parsed_data_lists = [[], []]
+        piece_generators = [TextParser.iterate_parsed_pieces(lines) for lines in line_lists]
+        while piece_generators[0] is not None or piece_generators[1] is not None:
+            for i, piece_generator in enumerate(piece_generators):
+                if piece_generator is not None:
+                    piece = next(piece_generator, None)
+                    if piece is None:
+                        piece_generators[i] = None
+                    else:
+                        parsed_data_lists[i].append(piece)
+
+        # then
+        self.assertEqual([[[1], 'p'], [[2, 3, 4], ''], ['a\nb', ''], ['', '_empty_line'], ['c', '']], empty_lines_data)
+        self.assertEqual(expected_data_list[0], normalize(first_parsed_data))
+        self.assertEqual(expected_data_list[1], normalize(second_parsed_data))
+        self.assertEqual(expected_data_list[0], normalize(third_parsed_data))
+        self.assertEqual(expected_data_list, [normalize(parsed_data) for parsed_data in parsed_data_lists])
+
+    def test_escaped_and_unclosed_inline_tags(self):
+        # given
+        escaped_tag_lines = ['#p\n', 'a /*b*/x*/ c \\/*i*/y*/ d\n']
+        not_escaped_tag_lines = ['#p\n', 'a /*b*/x*/ \\c /*i*/y*/ d\n']
+        unclosed_tag_lines = ['#p\n', 'a /*b*/x and more\n']
+
+        # when
+        escaped_tag_data = TextParser().parse(escaped_tag_lines).get_json_data()
+        not_escaped_tag_data = TextParser().parse(not_escaped_tag_lines).get_json_data()
+        unclosed_tag_data = TextParser().parse(unclosed_tag_lines).get_json_data()
+
+        # then
+        self.assertEqual(
+            [[[1], 'p'], [[2, 3, 4], ''], ['a ', ''], ['x', 'b'], [' c /*i*/y*/ d', '']], escaped_tag_data
+        )
+        self.assertEqual(
+            [[[1], 'p'], [[2, 3, 4, 5, 6], ''], ['a ', ''], ['x', 'b'], [' \\c ', ''], ['y', 'i'], [' d', '']],
+            not_escaped_tag_data
+        )
+        self.assertEqual([[[1], 'p'], ['a /*b*/x and more', '']], unclosed_tag_data)
+
+    def test_streaming_parsing(self):
+        # given
+        self._given_publish_list_test_folder()
+
+        # when
+        tt.write_publication_with_spine(Paths.get_spine_rel_path(), streaming=True)
+
+        # then
+        check_json_files_are_equal_to_expected_json_files(self)
+        check_pub_files_are_equal_to_expected_pub_files(self)
+
+    def test_streaming_parsing_with_jobs_is_rejected(self):
+        # given
+        self._given_publish_list_test_folder()
+        argv = ['tt', '--streaming', '--jobs', '2', Paths.get_spine_rel_path()]
+
+        # when
+        with self.assertRaises(ReaderError.StreamingWithJobsError):
+            tt.write_publication_with_spine(Paths.get_spine_rel_path(), jobs=2, streaming=True)
+        with mock.patch('sys.argv', argv), contextlib.redirect_stderr(io.StringIO()) as error_output:
+            with self.assertRaises(SystemExit):
+                tt_cli.main()
+
+        # then
+        self.assertIn('--streaming', error_output.getvalue())
+
+    def test_invalid_number_of_jobs_is_rejected(self):
+        # given
+        self._given_publish_list_test_folder()
+
+        for jobs in [0, -1]:
+            argv = ['tt', '--jobs', str(jobs), Paths.get_spine_rel_path()]
+
+            # when
+            with self.assertRaises(ReaderError.InvalidNumberOfJobsError):
+                tt.write_publication_with_spine(Paths.get_spine_rel_path(), jobs=jobs)
+            with mock.patch('sys.argv', argv), contextlib.redirect_stderr(io.StringIO()) as error_output:
+                with self.assertRaises(SystemExit):
+                    tt_cli.main()
+
+            # then
+            self.assertIn('at least 1', error_output.getvalue())
+
+    def test_parallel_parsing_of_file_segments(self):
+        # given
+        self._given_publish_list_test_folder()
+        min_size_of_segmented_file = _Reader._min_size_of_segmented_file
+        lines_per_segment = _Reader._lines_per_segment
+        _Reader._min_size_of_segmented_file = 0
+        _Reader._lines_per_segment = 1
+
+        # when
+        try:
+            tt.write_publication_with_spine(Paths.get_spine_rel_path(), jobs=2)
+        finally:
+            _Reader._min_size_of_segmented_file = min_size_of_segmented_file
+            _Reader._lines_per_segment = lines_per_segment
+
+        # then
+        check_json_files_are_equal_to_expected_json_files(self)
+        check_pub_files_are_equal_to_expected_pub_files(self)
+
+    def test_json_cache_with_touched_tt_files(self):
+        # given
+        self._given_publish_list_test_folder()
+        self._when_write_publication_with_spine_capturing_output(jobs=1)
+        for tt_file_path in Paths.get_test_file_list():
+            os.utime(os.path.join(Paths.get_test_rel_folder(), tt_file_path))
+
+        # when
+        output = self._when_write_publication_with_spine_capturing_output(jobs=1)
+
+        # then
+        check_json_files_are_equal_to_expected_json_files(self)
+        check_pub_files_are_equal_to_expected_pub_files(self)
+        self.assertIn('Json cache: 5 hits, 0 misses.', output)
+
+    def test_template_edit_does_not_parse_contents_again(self):
+        # given
+        with tempfile.TemporaryDirectory(dir='tests') as test_abs_folder:
+            shutil.copytree(
+                'tests/base_spine_publish_list_content_list', test_abs_folder, dirs_exist_ok=True,
+                ignore=shutil.ignore_patterns('json', 'pub')
+            )
+            spine_rel_path = os.path.join(os.path.relpath(test_abs_folder), 'spine.tt')
+            with contextlib.redirect_stdout(io.StringIO()):
+                tt.write_publication_with_spine(spine_rel_path)
+
+            template_file_path = os.path.join(test_abs_folder, 'template', 'style.tt')
+            with open(template_file_path, encoding='utf-8') as template_file_stream:
+                template_text = template_file_stream.read()
+            with open(template_file_path, 'w', encoding='utf-8') as template_file_stream:
+                template_file_stream.write(template_text.replace('<h1>', '<h2>').replace('</h1>', '</h2>'))
+
+            # when
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                tt.write_publication_with_spine(spine_rel_path)
+
+            # then
+            self.assertIn('chapter 1*; chapter 2*; chapter 3*; spine*; style;', output.getvalue())
+            self.assertIn('Json cache: 4 hits, 1 misses.', output.getvalue())
+            with open(os.path.join(test_abs_folder, 'pub', 'chapter 1.html'), encoding='utf-8') as pub_file_stream:
+                self.assertIn('<h2>', pub_file_stream.read())
+
+    def test_json_cache_after_a_failed_run(self):
+        # given
+        with tempfile.TemporaryDirectory(dir='tests') as test_abs_folder:
+            shutil.copytree(
+                'tests/base_spine_publish_list_content_list', test_abs_folder, dirs_exist_ok=True,
+                ignore=shutil.ignore_patterns('json', 'pub')
+            )
+            spine_rel_path = os.path.join(os.path.relpath(test_abs_folder), 'spine.tt')
+            with contextlib.redirect_stdout(io.StringIO()):
+                tt.write_publication_with_spine(spine_rel_path)
+
+            tt_texts = {}
+            for tt_file_name in ['chapter 1.tt', 'chapter 3.tt']:
+                with open(os.path.join(test_abs_folder, tt_file_name), encoding='utf-8') as tt_file_stream:
+                    tt_texts[tt_file_name] = tt_file_stream.read()
+            with open(os.path.join(test_abs_folder, 'chapter 1.tt'), 'w', encoding='utf-8') as tt_file_stream:
+                tt_file_stream.write(tt_texts['chapter 1.tt'].replace('chapter 1', 'an edited chapter'))
+            with open(os.path.join(test_abs_folder, 'chapter 3.tt'), 'w', encoding='utf-8') as tt_file_stream:
+                tt_file_stream.write('###deep\nA skipped tag level.\n')
+            with contextlib.redirect_stdout(io.StringIO()):
+                with self.assertRaises(ParserError.SkippedDeeperTagLevelError):
+                    tt.write_publication_with_spine(spine_rel_path)
+
+            for tt_file_name, tt_text in tt_texts.items():
+                with open(os.path.join(test_abs_folder, tt_file_name), 'w', encoding='utf-8') as tt_file_stream:
+                    tt_file_stream.write(tt_text)
+
+            # when
+            with contextlib.redirect_stdout(io.StringIO()):
+                tt.write_publication_with_spine(spine_rel_path)
+
+            # then
+            with open(os.path.join(test_abs_folder, 'pub', 'chapter 1.html'), encoding='utf-8') as pub_file_stream:
+                pub_text = pub_file_stream.read()
+            self.assertIn('This is the content of chapter 1.', pub_text)
+            self.assertNotIn('an edited chapter', pub_text)
+
+    def test_json_cache_of_control_chars(self):
+        # given
+        json_data = [[[1, 2], 'p'], ['a\ttab', ''], ['a \x01 control char, a \\ and a "quote"', 'note']]
+
+        with tempfile.TemporaryDirectory() as temp_abs_folder:
+            json_file_abs_path = os.path.join(temp_abs_folder, 'sample.json')
+
+            # when
+            JsonSerializer.save(json_data, json_file_abs_path)
+            with open(json_file_abs_path, encoding='utf-8') as json_file_stream:
+                json_text = json_file_stream.read()
+            loaded_json_data = JsonSerializer.load(json_file_abs_path)
+
+        # then
+        self.assertNotIn('\t', json_text)
+        self.assertNotIn('\x01', json_text)
+        self.assertEqual(json_data, loaded_json_data)
+
+    def test_binary_cache_format(self):
+        # given
+        self._given_publish_list_test_folder()
+        test_folder = Paths.get_test_rel_folder()
+        for ttb_file_path in glob.glob(os.path.join(test_folder, 'json', '*.ttb')):
+            os.remove(ttb_file_path)
+
+        # when
+        tt.write_publication_with_spine(Paths.get_spine_rel_path(), cache_format='ttb')
+
+        # then
+        check_pub_files_are_equal_to_expected_pub_files(self)
+        json_check_file_paths = sorted(glob.glob(os.path.join(test_folder, 'json-check', '*.json')))
+        for json_check_file_path in json_check_file_paths:
+            file_name = os.path.basename(json_check_file_path).replace('.json', '.ttb')
+            ttb_file_path = os.path.join(test_folder, 'json', file_name)
+            self.assertEqual(JsonSerializer.load(json_check_file_path), MarshalSerializer.load(ttb_file_path))
+            os.remove(ttb_file_path)
+
+        self.assertEqual([], glob.glob(os.path.join(test_folder, 'json', '*.json')))
+
+    def test_parsed_files_are_not_read_again(self):
+        # given
+        self._given_publish_list_test_folder()
+
+        # when
+        with mock.patch.object(JsonSerializer, 'load', wraps=JsonSerializer.load) as load:
+            self._when_write_publication_with_spine_capturing_output(jobs=1)
+
+        # then
+        self.assertEqual(0, load.call_count)
+        check_json_files_are_equal_to_expected_json_files(self)
+        check_pub_files_are_equal_to_expected_pub_files(self)
+
+    def test_tagged_pieces_read_like_json_data(self):
+        # given
+        json_data_list = [
+            JsonSerializer.load(json_check_file_path)
+            for json_check_file_path in sorted(glob.glob('tests/*/json-check/*.json'))
+        ]
+
+        for json_data, next_json_data in zip(json_data_list, json_data_list[1:]):
+            # when
+            tagged_pieces = TaggedPieces.from_pieces(json_data)
+            joined_content = JoinedContent([tagged_pieces, TaggedPieces.from_pieces(next_json_data)])
+
+            # then
+            self.assertEqual(json_data, list(tagged_pieces))
+            self.assertEqual(json_data, [tagged_pieces[i] for i in range(len(tagged_pieces))])
+            shifted_json_data = [
+                [[piece_id + len(json_data) for piece_id in value] if type(value) is list else value, tag]
+                for value, tag in next_json_data
+            ]
+            self.assertEqual(json_data + shifted_json_data, list(joined_content))
+            self.assertEqual(json_data + shifted_json_data, [joined_content[i] for i in range(len(joined_content))])
+            copied_tagged_pieces = TaggedPieces.from_pieces(list(joined_content))
+            for piece_id in range(len(joined_content)):
+                self.assertEqual(copied_tagged_pieces.get_parent(piece_id), joined_content.get_parent(piece_id))
+                self.assertEqual(copied_tagged_pieces.get_depth(piece_id), joined_content.get_depth(piece_id))
+                self.assertEqual(
+                    copied_tagged_pieces.get_subtree_end(piece_id), joined_content.get_subtree_end(piece_id))
+                self.assertEqual(len(json_data) > piece_id, joined_content.get_part_index(piece_id) == 0)
+                tag_name = joined_content.get_tag(piece_id)
+                for is_nested in [False, True]:
+                    self.assertEqual(
+                        copied_tagged_pieces.find_next_piece_with_tag(tag_name, piece_id, is_nested),
+                        joined_content.find_next_piece_with_tag(tag_name, piece_id, is_nested)
+                    )
+
+    def test_structure_of_tagged_pieces(self):
+        # given
+        json_data = [[[1, 3], 'list'], [[2], 'item'], ['a', 'text'], [[4, 5], 'item'], ['b', 'text'], ['c', 'note']]
+        tagged_pieces = TaggedPieces.from_pieces(json_data)
+
+        with tempfile.TemporaryDirectory() as temp_abs_folder:
+            json_file_abs_path = os.path.join(temp_abs_folder, 'sample.json')
+            JsonSerializer.save(json_data, json_file_abs_path)
+            JsonSerializer.save_structure(tagged_pieces, json_file_abs_path)
+
+            # when
+            loaded_tagged_pieces = TaggedPieces.from_pieces(JsonSerializer.load(json_file_abs_path))
+            is_structure_loaded = JsonSerializer.load_structure(loaded_tagged_pieces, json_file_abs_path)
+            JsonSerializer.save(json_data[0:3], json_file_abs_path)
+            is_stale_structure_loaded = JsonSerializer.load_structure(
+                TaggedPieces.from_pieces(json_data[0:3]), json_file_abs_path
+            )
+
+        # then
+        self.assertTrue(is_structure_loaded)
+        self.assertFalse(is_stale_structure_loaded)
+        for pieces in [tagged_pieces, loaded_tagged_pieces]:
+            self.assertEqual([-1, 0, 1, 0, 3, 3], [pieces.get_parent(i) for i in range(6)])
+            self.assertEqual([1, 2, 3, 2, 3, 3], [pieces.get_depth(i) for i in range(6)])
+            self.assertEqual([5, 2, 2, 5, 4, 5], [pieces.get_subtree_end(i) for i in range(6)])
+            self.assertEqual([1, 3, 3, -1], [pieces.find_next_piece_with_tag('item', i, True) for i in [0, 2, 3, 4]])
+            self.assertEqual([0, -1], [pieces.find_next_piece_with_tag('list', i, False) for i in [0, 1]])
+            self.assertEqual(-1, pieces.find_next_piece_with_tag('title', 0, True))
+            self.assertEqual(['abc', 'a', 'a', 'bc', 'b', 'c'], [pieces.get_raw_value(i) for i in range(6)])
+
+    def test_items_of_joined_tagged_texts(self):
+        # given
+        TaggedTexts.reset()
+        TaggedTexts.put('chapter 1', [[[1], 'title'], ['One', 'text'], ['a', 'text']])
+        TaggedTexts.put('chapter 2', [[[1, 2], 'title'], ['Two', 'text'], ['b', 'note']])
+        tt_file_name_list = ['chapter 1', 'chapter 2']
+
+        # when
+        tt_names = [
+            TaggedTexts.get_tt_name_related_to_an_item_in_joined_tts(tt_file_name_list, i) for i in range(-1, 7)
+        ]
+        tagged_lines = [
+            TaggedTexts.get_tagged_line(tt_file_name_list, i)
+            for i in range(TaggedTexts.get_item_number(tt_file_name_list))
+        ]
+
+        # then
+        self.assertEqual([None] + ['chapter 1'] * 3 + ['chapter 2'] * 3 + [None], tt_names)
+        self.assertEqual(
+            [[[1], 'title'], ['One', 'text'], ['a', 'text'], [[4, 5], 'title'], ['Two', 'text'], ['b', 'note']],
+            tagged_lines
+        )
+        self.assertIs(TaggedTexts.get(tt_file_name_list), TaggedTexts.get(tt_file_name_list))
+        TaggedTexts.reset()
+
+    def test_tagged_pieces_of_rules_and_lists(self):
+        # given
+        self._given_publish_list_test_folder()
+        self._when_write_publication_with_spine_capturing_output(jobs=1)
+        pieces = [[[1], 'p'], ['a', '']]
+
+        # when
+        raw_value = TaggedTexts.get_raw_value(pieces, 0)
+        pieces[1][0] = 'b'
+        raw_value_of_changed_pieces = TaggedTexts.get_raw_value(pieces, 0)
+
+        # then
+        self.assertIsInstance(Templates.get_rules('style'), TaggedPieces)
+        self.assertEqual(['a', 'b'], [raw_value, raw_value_of_changed_pieces])
+
+    def test_file_cache_of_included_files(self):
+        # given
+        file_cache = FileCache(max_size=10)
+        with tempfile.TemporaryDirectory() as temp_abs_folder:
+            file_abs_paths = [os.path.join(temp_abs_folder, name) for name in ['a.txt', 'b.txt', 'c.txt']]
+            for file_abs_path in file_abs_paths:
+                with open(file_abs_path, 'w', encoding='utf-8') as f:
+                    f.write('1234')
+
+            # when
+            texts = [file_cache.get_text(file_abs_path) for file_abs_path in file_abs_paths]
+            with open(file_abs_paths[2], 'w', encoding='utf-8') as f:
+                f.write('12345')
+            with mock.patch('builtins.open', wraps=open) as open_mock:
+                changed_text = file_cache.get_text(file_abs_paths[2])
+                file_cache.get_text(file_abs_paths[1])
+                file_cache.get_text(file_abs_paths[0])
+
         # then
+        self.assertEqual(['1234', '1234', '1234'], texts)
+        self.assertEqual('12345', changed_text)
+        self.assertEqual(
+            [file_abs_paths[2], file_abs_paths[0]], [call.args[0] for call in open_mock.call_args_list]
+        )
 
 
 if __name__ == '__main__':
@@ -0,0 +1,56 @@
+"""The command line interface of the Tagged Text module.
+
+Usage: python -m tt [--jobs N] [--streaming] [--cache-format {json,ttb}] tt_spine_rel_path
+"""
+
+import argparse
+from tt.controller.main import write_publication_with_spine
+
+
+def _number_of_jobs(text: str):
+    """Read the number of jobs from the command line, it has to be an integer of at least 1.
+
+    :param text: the number of jobs as it is written in the command line.
+    :return: the number of jobs.
+    """
+    try:
+        jobs = int(text)
+    except ValueError:
+        jobs = 0
+
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(f"the number of jobs has to be an integer of at least 1, not '{text}'")
+
+    return jobs
+
+
+def main():
+    """Read the command line arguments and write the publication of the given spine file."""
+
+    argument_parser = argparse.ArgumentParser(
+        prog='tt', description='Make a publication from a tagged text spine file.'
+    )
+    argument_parser.add_argument('tt_spine_rel_path', help='the relative path of the tt spine file')
+    argument_parser.add_argument(
+        '-j', '--jobs', type=_number_of_jobs, default=1,
+        help='the number of processes that parse the tt files (default: 1)'
+    )
+    argument_parser.add_argument(
+        '--streaming', action='store_true',
+        help='parse the tt files one top-level block at a time to save memory, it cannot be used with --jobs'
+    )
+    argument_parser.add_argument(
+        '--cache-format', choices=['json', 'ttb'], default='json',
+        help='the format of the intermediate files, ttb is binary and faster to load (default: json)'
+    )
+    arguments = argument_parser.parse_args()
+    if arguments.streaming and arguments.jobs > 1:
+        argument_parser.error('argument --streaming: not allowed with more than 1 job')
+
+    write_publication_with_spine(
+        arguments.tt_spine_rel_path, arguments.jobs, arguments.streaming, arguments.cache_format
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 """The Compositor of tagged texts that applies template rules to the tagged content."""
 
 import os
+import functools
 
 from tt.controller.exceptions import *
 from tt.model.regex import Regex
@@ -9,6 +10,7 @@ from tt.model.taggedtexts import Type as TtType
 from tt.model.taggedtexts import TaggedTexts
 from tt.model.templates import Templates
 from tt.model.parsingtree import parsing_tree
+from tt.model.filecache import file_cache
 from tt.model.publications import *
 
 
@@ -98,22 +100,11 @@ class ContentPiece:
         if content_data:
             tag = self._piece[1]
 
-        # Since a tag can have a tag rule with a tag list rule at the same time,
-        # it needs to search in every template and put together these types of rules.
-        # Moreover, the following template rules overwrite the previous template rules.
-        template_name_index = len(template_names) - 1
-        while template_name_index > -1:
-            rule_template_name = template_names[template_name_index]
-
-            if tag in Templates.get_triggers(rule_template_name):
-                rule_index = Templates.get_rule_index(rule_template_name, tag)
-                self._found_rule = TemplateRule(rule_index, rule_template_name)
-
-            if '_list_' + tag in Templates.get_triggers(rule_template_name):
-                rule_index = Templates.get_rule_index(rule_template_name, '_list_' + tag)
-                self._found_list_rule = TemplateRule(rule_index, rule_template_name)
-
-            template_name_index -= 1
+        # Since a tag can have a tag rule with a tag list rule at the same time, both are taken from the rules resolved
+        # for the template list, where the previous templates overwrite the following template rules.
+        if template_names:
+            resolved_rules = Compositor.get_resolved_rules(template_names)
+            self._found_rule, self._found_list_rule = resolved_rules.get(tag, (None, None))
 
     def get_index(self):
         """Get the index of the parsed text piece."""
@@ -147,21 +138,14 @@ class ContentPiece:
         :return: the string value related to the content piece avoiding applying rules.
         """
         if starting_piece_value is None:
-            starting_piece_value = self._piece[0]
+            return TaggedTexts.get_raw_value(self._content_data, self._piece_index)
 
-        value = ''
         if type(starting_piece_value) is list:
-            for sub_piece_id in starting_piece_value:
-                sub_piece_value = self._content_data[sub_piece_id][0]
+            return ''.join([
+                TaggedTexts.get_raw_value(self._content_data, sub_piece_id) for sub_piece_id in starting_piece_value
+            ])
 
-                if type(sub_piece_value) is list:
-                    value += self.get_raw_value(sub_piece_value)
-                else:
-                    value += sub_piece_value
-        else:
-            value += starting_piece_value
-
-        return value
+        return starting_piece_value
 
     def get_template_name_list(self):
         """Get the template list where it is possible to find the rule for the parsed text piece."""
@@ -186,32 +170,10 @@ class ContentPiece:
     def get_depth_level(self, piece_index: int = -1):
         """Get the level of the piece (tagged or not) in its content."""
 
-        current_previous_index = 0
         if piece_index == -1:
-            index_to_check = self._piece_index
-        else:
-            index_to_check = piece_index
-
-        level = 1
-        new_level = True
+            piece_index = self._piece_index
 
-        while new_level:
-            new_level = False
-
-            for piece in self._content_data:
-                if current_previous_index >= index_to_check:
-                    break
-                if type(piece[0]) is list:
-                    for sub_piece_index in piece[0]:
-                        if index_to_check == sub_piece_index:
-                            level += 1
-                            index_to_check = current_previous_index
-                            new_level = True
-                            break
-
-                current_previous_index += 1
-
-        return level
+        return TaggedTexts.get_depth_level(self._content_data, piece_index)
 
     def apply_rule_and_arrange_value(self):
         """Apply the found rule of the parsed text piece producing the text result with the Compositor."""
@@ -254,6 +216,9 @@ class Compositor:
     _current_rule_index = 0
     _current_rule = None
     _current_pub_file_name = ''
+    _resolved_rules = {}  # key: tuple of template names; value: dict with key tag and value (rule, list rule)
+    _rule_programs = {}  # key: (template name, rule index); value: the compiled operations of the rule
+    _list_layouts = {}  # key: (template name, rule index, ...); value: the layout of the list rule
 
     @classmethod
     def set_content_reference(cls, content_name_list: list):
@@ -294,14 +259,7 @@ class Compositor:
         if item_index >= len(content_data):
             return 0
 
-        initial_index = item_index
-        item = content_data[item_index]
-
-        while type(item[0]) is list:
-            item_index = item[0][-1]
-            item = content_data[item_index]
-
-        return item_index - initial_index + 1
+        return TaggedTexts.get_tagged_pieces(content_data).get_subtree_end(item_index) - item_index + 1
 
     @classmethod
     def look_for_rule_in_templates(cls, tag: str, tag_list_first: bool = False):
@@ -311,27 +269,46 @@ class Compositor:
         :param tag_list_first: if a tag list rule is present, with True it is checked first.
         :return: the found rule or None if nothing is found.
         """
-        cls._current_rule = None
-        tags_to_search = []
+        rule, list_rule = cls.get_resolved_rules(cls._current_template_name_list).get(tag, (None, None))
+        if tag_list_first and list_rule:
+            rule = list_rule
 
-        if tag_list_first:
-            tags_to_search.append('_list_' + tag)
-        tags_to_search.append(tag)
+        cls._current_rule = rule
+        if rule:
+            cls._current_template_name = rule.get_template_name()
+            cls._current_rule_index = rule.get_tag_rule_index()
 
-        for tag in tags_to_search:
-            template_name_index = len(cls._current_template_name_list) - 1
+        return cls._current_rule
 
-            while template_name_index > -1:
-                if tag in Templates.get_triggers(cls._current_template_name_list[template_name_index]):
-                    cls._current_template_name = cls._current_template_name_list[template_name_index]
-                    cls._current_rule_index = Templates.get_rule_index(cls._current_template_name, tag)
-                    cls._current_rule = TemplateRule(cls._current_rule_index, cls._current_template_name)
-                template_name_index -= 1
+    @classmethod
+    def get_resolved_rules(cls, template_names: list):
+        """Get the rule and the tag list rule applied to each tag by a list of templates. When more templates have a
+        rule for the same tag, the previous template overwrites the following ones. The rules are resolved once for
+        each template list.
 
-            if cls._current_rule:
-                break
+        :param template_names: the list of template names where to search the rules.
+        :return: a dictionary with key the tag and value a tuple with the rule and the tag list rule, or None.
+        """
+        template_names_key = tuple(template_names)
+        resolved_rules = cls._resolved_rules.get(template_names_key)
+        if resolved_rules is None:
+            rules = {}  # key: trigger tag, with the '_list_' prefix for a tag list rule; value: the template rule
+            for template_name in reversed(template_names_key):
+                for trigger_tag, rule_index in Templates.get_triggers(template_name).items():
+                    rules[trigger_tag] = TemplateRule(rule_index, template_name)
 
-        return cls._current_rule
+            resolved_rules = {}
+            for trigger_tag in rules:
+                tags = [trigger_tag]
+                if trigger_tag.startswith('_list_'):
+                    tags.append(trigger_tag[len('_list_'):])
+
+                for tag in tags:
+                    resolved_rules[tag] = (rules.get(tag), rules.get('_list_' + tag))
+
+            cls._resolved_rules[template_names_key] = resolved_rules
+
+        return resolved_rules
 
     @classmethod
     def is_last_tag_found_in_rules(cls):
@@ -353,7 +330,7 @@ class Compositor:
         """Get the current content data related to the current rule."""
 
         if TaggedTexts.get_current_tt_type() == TtType.SPINE:
-            content_data = parsing_tree.get_json_data()
+            content_data = parsing_tree.get_tagged_pieces()
 
         elif TaggedTexts.get_current_tt_type() == TtType.TEMPLATE:
             content_data = Templates.get_rules(cls._current_template_name)
@@ -403,7 +380,7 @@ class Compositor:
 
         # If the first child is a list, continue to assemble a raw value
         if type(value) is list:
-            value = ContentPiece(content_data, piece_index, []).get_raw_value()
+            value = TaggedTexts.get_raw_value(content_data, piece_index)
 
         return value
 
@@ -493,15 +470,14 @@ class Compositor:
         else:
             initial_level = TaggedTexts.get_depth_level(content_data, start_index) + 1
 
-        content_index = start_index
-        while content_index < len(content_data):
-            item = content_data[content_index]
-            current_level = TaggedTexts.get_depth_level(content_data, content_index)
-
-            if current_level == initial_level and item[1] == next_tag:
-                return cls.get_raw_first_value_of_item(item)
-
-            content_index += 1
+        # The depth levels are only 1 for a top-level piece and 2 for a nested one, so the next tag is searched among
+        # the top-level pieces or among the nested ones
+        if initial_level <= 2:
+            next_index = TaggedTexts.get_tagged_pieces(content_data).find_next_piece_with_tag(
+                next_tag, start_index, initial_level == 2
+            )
+            if next_index != -1:
+                return cls.get_raw_first_value_of_item(content_data[next_index])
 
         return default
 
@@ -549,103 +525,248 @@ class Compositor:
 
             return cls.get_involved_item_number_in_an_item(content_piece.get_index(), content_piece.get_content_data())
 
-        content_index = content_piece.get_index()
-        content_data = content_piece.get_content_data()
+        for operation in cls.get_rule_program(template_rule):
+            if type(operation) is str:
+                Publications.add_branch(operation)
+            else:
+                operation(content_piece)
+
+        return cls.get_involved_item_number_in_an_item(content_piece.get_index(), content_piece.get_content_data())
+
+    @classmethod
+    def get_rule_program(cls, template_rule: TemplateRule):
+        """Get the program of a tag rule, compiled once for each rule. The program is a list of operations: a string is
+        a constant text to add to the publication, where the consecutive constant texts are already merged, and a
+        callable is a dynamic step to run with the content piece.
+
+        :param template_rule: the tag rule to compile.
+        :return: the list of operations of the rule.
+        """
+        rule_key = (template_rule.get_template_name(), template_rule.get_tag_rule_index())
+        rule_program = cls._rule_programs.get(rule_key)
+        if rule_program is None:
+            rule_program = []
+            for operation in cls._compile_rule_pieces(template_rule):
+                if type(operation) is str and rule_program and type(rule_program[-1]) is str:
+                    rule_program[-1] += operation
+                else:
+                    rule_program.append(operation)
+
+            cls._rule_programs[rule_key] = rule_program
+
+        return rule_program
+
+    @classmethod
+    def _compile_rule_pieces(cls, template_rule: TemplateRule):
+        """Compile each piece of a tag rule into a constant text or a dynamic step.
+
+        :param template_rule: the tag rule to compile.
+        :return: a generator of the operations of the rule, in order.
+        """
+        template_data = template_rule.get_template_data()
 
         for rule_piece_index in template_rule.get_sub_pieces():
             rule_piece = template_data[rule_piece_index]
 
             if rule_piece[1] == 'text':
-                cls.arrange_first_value_of_item_thru_its_content(rule_piece, template_data)
+                value = template_data[rule_piece[0][0]][0]
+                if type(value) is list:
+                    yield functools.partial(cls._arrange_template_text, value, template_data)
+                else:
+                    yield value
 
             elif rule_piece[1] == 'space':
-                Publications.add_branch(' ')
+                yield ' '
 
             elif rule_piece[1] == 'new-line':
-                Publications.add_branch('\n')
+                yield '\n'
 
             elif rule_piece[1] == 'from-subtag':
                 subtag_name = cls.get_raw_first_value_of_item(rule_piece, template_data)
-                subtag_index, subtag_value = cls.get_raw_subtag_value_of_tag(
-                    content_data[content_index], subtag_name, '', content_data, True
-                )
-                if type(subtag_value) is list:
-                    cls.look_for_rules_for_each_items(subtag_value, content_data)
-                else:
-                    Publications.add_branch(subtag_value)
+                yield functools.partial(cls._arrange_subtag_value, subtag_name)
 
             elif rule_piece[1] == 'from-next-tag':
-                start_index = 0
-                next_tag_name = cls.get_raw_first_value_of_item_thru_piece(
-                    rule_piece, content_piece, template_as_content=True
-                )
-                if content_piece.get_tag() in ['file-opening', 'file-ending']:
-                    content_data = TaggedTexts.get(spine.get_content_head_of_current_pub_item())
-                    start_index = -1
-                else:
-                    start_index = content_index
-                next_tag_value = cls.get_raw_next_tag_value(content_data, start_index, next_tag_name)
-                Publications.add_branch(next_tag_value)
+                value = template_data[rule_piece[0][0]][0]
+                while type(value) is list:
+                    value = template_data[value[0]][0]
+                yield functools.partial(cls._arrange_next_tag_value, value)
 
             elif rule_piece[1] == 'from-var':
-                value = spine.get_variable(cls.get_raw_first_value_of_item(rule_piece, template_data))
-                Publications.add_branch(value)
+                variable_name = cls.get_raw_first_value_of_item(rule_piece, template_data)
+                yield functools.partial(cls._arrange_variable_value, variable_name)
 
             elif rule_piece[1] == 'from-counter':
                 counter_name = cls.get_raw_first_value_of_item(rule_piece, template_data)
-                value = str(spine.counters.get_value(counter_name))
-                Publications.add_branch(value)
-                spine.counters.take_a_step(counter_name)
+                yield functools.partial(cls._arrange_counter_value, counter_name)
 
             elif rule_piece[1] == 'from-file':
-                file_name = cls.get_raw_first_value_of_item_thru_piece(
-                    rule_piece, content_piece, template_as_content=True
-                )
-                template_rel_folder = spine.paths.get_template_files_rel_folder()
-                file_path = os.path.join(spine.paths.make_file_abs_folder, template_rel_folder, file_name)
-                f = open(file_path, 'r', encoding='utf-8')
-                value = ''.join(f.readlines())
-                f.close()
-                Publications.add_branch(value)
+                value = template_data[rule_piece[0][0]][0]
+                while type(value) is list:
+                    value = template_data[value[0]][0]
+                yield functools.partial(cls._arrange_file_value, value)
 
             elif rule_piece[1] == 'content':
-                cls.look_for_rules_for_each_items(content_data[content_index][0], content_data)
-            else:
-                if rule_piece[1] != "":
-                    print("rule_piece[1] not managed:", rule_piece[1])
+                yield cls._arrange_content_value
 
-        return cls.get_involved_item_number_in_an_item(content_piece.get_index(), content_piece.get_content_data())
+            elif rule_piece[1] != "":
+                yield functools.partial(cls._print_not_managed_rule_piece, rule_piece[1])
 
     @classmethod
-    def arrange_content_list(cls, content_piece: ContentPiece):
-        """Arrange the value of a content split into pieces and composed in a list in the publication.
+    def _arrange_template_text(cls, text_pieces: list, template_data: list, content_piece: ContentPiece):
+        """Arrange a text of the template composed by pieces, applying the rules to its tagged pieces.
 
-        :param content_piece: the piece of content whose value has to be processed and arranged in the publication.
+        :param text_pieces: the IDs of the pieces of the text in the template.
+        :param template_data: the template data of the rule.
+        :param content_piece: the content piece to which the rule is applied.
+        """
+        cls.look_for_rules_for_each_items(text_pieces, template_data)
+
+    @classmethod
+    def _arrange_subtag_value(cls, subtag_name: str, content_piece: ContentPiece):
+        """Arrange the value of a subtag of the content piece.
+
+        :param subtag_name: the tag name of the subtag.
+        :param content_piece: the content piece to which the rule is applied.
+        """
+        content_data = content_piece.get_content_data()
+        subtag_index, subtag_value = cls.get_raw_subtag_value_of_tag(
+            content_piece.get_piece(), subtag_name, '', content_data, True
+        )
+        if type(subtag_value) is list:
+            cls.look_for_rules_for_each_items(subtag_value, content_data)
+        else:
+            Publications.add_branch(subtag_value)
+
+    @classmethod
+    def _arrange_next_tag_value(cls, next_tag_name: str, content_piece: ContentPiece):
+        """Arrange the value of the next tag after the content piece, or of the first one in the head content file for
+        a file opening or a file ending.
+
+        :param next_tag_name: the tag name of the next tag.
+        :param content_piece: the content piece to which the rule is applied.
         """
-        # lists of couples: {key: type of text piece; value: value of the text piece}
+        if content_piece.get_tag() in ['file-opening', 'file-ending']:
+            content_data = TaggedTexts.get(spine.get_content_head_of_current_pub_item())
+            start_index = -1
+        else:
+            content_data = content_piece.get_content_data()
+            start_index = content_piece.get_index()
+
+        Publications.add_branch(cls.get_raw_next_tag_value(content_data, start_index, next_tag_name))
+
+    @classmethod
+    def _arrange_variable_value(cls, variable_name: str, content_piece: ContentPiece):
+        """Arrange the value of a variable of the spine.
+
+        :param variable_name: the name of the variable.
+        :param content_piece: the content piece to which the rule is applied.
+        """
+        Publications.add_branch(spine.get_variable(variable_name))
+
+    @classmethod
+    def _arrange_counter_value(cls, counter_name: str, content_piece: ContentPiece):
+        """Arrange the current value of a counter and take a step of it.
+
+        :param counter_name: the name of the counter.
+        :param content_piece: the content piece to which the rule is applied.
+        """
+        Publications.add_branch(str(spine.counters.get_value(counter_name)))
+        spine.counters.take_a_step(counter_name)
+
+    @classmethod
+    def _arrange_file_value(cls, file_name: str, content_piece: ContentPiece):
+        """Arrange the text of a file in the template folder. The text is read once and then taken from the file cache.
+
+        :param file_name: the name of the file.
+        :param content_piece: the content piece to which the rule is applied.
+        """
+        template_rel_folder = spine.paths.get_template_files_rel_folder()
+        file_path = os.path.join(spine.paths.make_file_abs_folder, template_rel_folder, file_name)
+        Publications.add_branch(file_cache.get_text(file_path))
+
+    @classmethod
+    def _arrange_content_value(cls, content_piece: ContentPiece):
+        """Arrange the content of the content piece, applying the rules to its tagged pieces.
+
+        :param content_piece: the content piece to which the rule is applied.
+        """
+        cls.look_for_rules_for_each_items(content_piece.get_sub_pieces(), content_piece.get_content_data())
+
+    @classmethod
+    def _print_not_managed_rule_piece(cls, rule_piece_tag: str, content_piece: ContentPiece):
+        """Print the tag of a rule piece that is not managed.
+
+        :param rule_piece_tag: the tag of the rule piece.
+        :param content_piece: the content piece to which the rule is applied.
+        """
+        print("rule_piece[1] not managed:", rule_piece_tag)
+
+    @classmethod
+    def get_list_layout(cls, content_piece: ContentPiece, is_tag_list: bool):
+        """Get the layout of a tag list rule or of a content list rule: the texts of the list, the item separator and
+        the texts of the items. The layout depends only on the template, so it is built once for each rule.
+
+        :param content_piece: the content piece to which the rule is applied.
+        :param is_tag_list: True for the tag list rule of the content piece, False for its content list rule.
+        :return: a tuple with the list texts, the item separator, the item texts and the tags of a tag list.
+        """
+        if is_tag_list:
+            template_rule = content_piece.get_found_list_rule()
+        else:
+            template_rule = content_piece.get_found_rule()
+
+        # The text of the item separator is read from the template of the tag rule, also for a tag list rule
+        separator_template_name = None
+        if content_piece.get_found_rule():
+            separator_template_name = content_piece.get_found_rule().get_template_name()
+
+        layout_key = (
+            template_rule.get_template_name(), template_rule.get_tag_rule_index(), is_tag_list, separator_template_name
+        )
+        list_layout = cls._list_layouts.get(layout_key)
+        if list_layout is None:
+            list_layout = cls._build_list_layout(content_piece, template_rule, is_tag_list)
+            cls._list_layouts[layout_key] = list_layout
+
+        return list_layout
+
+    @classmethod
+    def _build_list_layout(cls, content_piece: ContentPiece, template_rule: TemplateRule, is_tag_list: bool):
+        """Build the layout of a tag list rule or of a content list rule walking its subtags.
+
+        :param content_piece: the content piece to which the rule is applied.
+        :param template_rule: the tag list rule or the content list rule.
+        :param is_tag_list: True for a tag list rule, False for a content list rule.
+        :return: a tuple with the list texts, the item separator, the item texts and the tags of a tag list.
+        """
+        # lists of couples: {key: type of text piece; value: value of text piece}
         # 1° list: the beginning of the list
         # 2° list: the end of the list
         # In the middle can be present only 1 content (the list of items)
         list_text = [[], []]
         item_separator = ''
 
-        # list of item_text subrules, each list is a list of 3 lists of couples.
-        # Lists of couples: {key: type of text piece; value: value of the text piece}
+        # List of item_text subrules, each list is a list of 3 lists of couples.
+        # Lists of couples: {key: type of text piece; value: value of a text piece}
         # 1° list: the beginning of the item
         # 2° list: the content and the things between contents of the item
         # 3° list: the end of the item
         items_text = []
         item_text_index = -1
 
-        template_rule = content_piece.get_found_rule()
         template_data = template_rule.get_template_data()
 
+        # The first subtag of a tag list rule is the list of its tags
+        tag_list = []
         rule_piece_number = 0
+        if is_tag_list:
+            tag_list = Regex.whitespace_split(cls.get_raw_first_value_of_item(template_rule, template_data))
+            rule_piece_number = 1
+
         max_piece_number = len(template_rule.get_sub_pieces())
         while rule_piece_number < max_piece_number:
             rule_piece_index = template_rule.get_sub_pieces()[rule_piece_number]
             rule_piece = template_data[rule_piece_index]
-
             if rule_piece[1] == 'list':
                 part = 0
                 for sub_rule_index in rule_piece[0]:
@@ -717,6 +838,12 @@ class Compositor:
                             "type": "new-line",
                             "value": "\n"
                         })
+                    elif sub_rule_piece[1] == 'from-subtag' and is_tag_list:
+                        subtag_name = cls.get_raw_first_value_of_item(sub_rule_piece, template_data)
+                        items_text[item_text_index][item_part_index].append({
+                            "type": "from-subtag",
+                            "value": subtag_name
+                        })
                     elif sub_rule_piece[1] == 'content':
                         if item_part_index == 0:
                             item_part_index += 1
@@ -745,8 +872,24 @@ class Compositor:
                         raise CompositorError.NotSupportedSubtagRuleError(
                             template_rule.get_template_name(), sub_rule_piece[1]
                         )
+
+                # if sub_rule content was not present, normalize items_text
+                if is_tag_list and len(items_text[item_text_index][1]) == 0:
+                    items_text[item_text_index][1] = items_text[item_text_index][0]
+                    items_text[item_text_index][0] = []
+
             rule_piece_number += 1
 
+        return list_text, item_separator, items_text, tag_list
+
+    @classmethod
+    def arrange_content_list(cls, content_piece: ContentPiece):
+        """Arrange the value of a content split into pieces and composed in a list in the publication.
+
+        :param content_piece: the piece of content whose value has to be processed and arranged in the publication.
+        """
+        list_text, item_separator, items_text = cls.get_list_layout(content_piece, is_tag_list=False)[0:3]
+
         # List opening
         for list_text_piece in list_text[0]:
             if list_text_piece['type'] == 'dynamic-text':
@@ -845,146 +988,7 @@ class Compositor:
 
         :param content_piece: the piece of content whose value to process and arrange in the publication.
         """
-        # lists of couples: {key: type of text piece; value: value of text piece}
-        # 1° list: the beginning of the list
-        # 2° list: the end of the list
-        # In the middle can be present only 1 content (the list of items)
-        list_text = [[], []]
-        item_separator = ''
-
-        # List of item_text subrules, each list is a list of 3 lists of couples.
-        # Lists of couples: {key: type of text piece; value: value of a text piece}
-        # 1° list: the beginning of the item
-        # 2° list: the content and the things between contents of the item
-        # 3° list: the end of the item
-        items_text = []
-        item_text_index = -1
-
-        template_rule = content_piece.get_found_list_rule()
-        template_data = template_rule.get_template_data()
-
-        tag_list = Regex.whitespace_split(
-            cls.get_raw_first_value_of_item(template_rule, template_data)
-        )
-
-        rule_piece_number = 1
-        max_piece_number = len(template_rule.get_sub_pieces())
-        while rule_piece_number < max_piece_number:
-            rule_piece_index = template_rule.get_sub_pieces()[rule_piece_number]
-            rule_piece = template_data[rule_piece_index]
-            if rule_piece[1] == 'list':
-                part = 0
-                for sub_rule_index in rule_piece[0]:
-                    sub_rule_piece = template_data[sub_rule_index]
-
-                    if sub_rule_piece[1] == 'text':
-                        list_text[part].append({
-                            "type": "dynamic-text",
-                            "value": [cls.look_for_rules_for_each_items, sub_rule_piece[0], template_data]
-                        })
-                    elif sub_rule_piece[1] == 'space':
-                        list_text[part].append({
-                            "type": "space",
-                            "value": " "
-                        })
-                    elif sub_rule_piece[1] == 'new-line':
-                        list_text[part].append({
-                            "type": "new-line",
-                            "value": "\n"
-                        })
-                    elif sub_rule_piece[1] == 'content':
-                        if part > 0:
-                            raise CompositorError.RepeatedContentSubtagError
-                        part += 1
-
-            elif rule_piece[1] == 'item-separator':
-                for sub_rule_index in rule_piece[0]:
-                    sub_rule_piece = template_data[sub_rule_index]
-
-                    if sub_rule_piece[1] == 'text':
-                        item_separator += Compositor.get_raw_first_value_of_item(
-                            sub_rule_piece, content_piece.get_found_rule().get_template_data()
-                        )
-
-                    elif sub_rule_piece[1] == 'space':
-                        item_separator += " "
-
-                    elif sub_rule_piece[1] == 'new-line':
-                        item_separator += "\n"
-
-                    elif sub_rule_piece[1] == '':
-                        item_separator += sub_rule_piece[0]
-
-            elif rule_piece[1] == 'item':
-                item_text_index += 1
-                items_text.append([[], [], []])
-                item_part_index = 0
-                item_last_content_index = -1
-
-                for sub_rule_index in rule_piece[0]:
-                    sub_rule_piece = template_data[sub_rule_index]
-
-                    if item_part_index == 1 and item_last_content_index != -1:
-                        if sub_rule_index > item_last_content_index:
-                            item_part_index += 1
-
-                    if sub_rule_piece[1] == 'text':
-                        items_text[item_text_index][item_part_index].append({
-                            "type": "dynamic-text",
-                            "value": [cls.look_for_rules_for_each_items, sub_rule_piece[0], template_data]
-                        })
-                    elif sub_rule_piece[1] == 'space':
-                        items_text[item_text_index][item_part_index].append({
-                            "type": "space",
-                            "value": " "
-                        })
-                    elif sub_rule_piece[1] == 'new-line':
-                        items_text[item_text_index][item_part_index].append({
-                            "type": "new-line",
-                            "value": "\n"
-                        })
-                    elif sub_rule_piece[1] == 'from-subtag':
-                        subtag_name = cls.get_raw_first_value_of_item(sub_rule_piece, template_data)
-                        items_text[item_text_index][item_part_index].append({
-                            "type": "from-subtag",
-                            "value": subtag_name
-                        })
-                    elif sub_rule_piece[1] == 'content':
-                        if item_part_index == 0:
-                            item_part_index += 1
-
-                        if item_last_content_index == -1:
-                            # Until there is a content subtag to be processed, the item part has to be the middle part.
-                            # So it needs to find the last occurrence of content subtag.
-                            exploring_index = len(rule_piece[0]) - 1
-                            while exploring_index >= 0:
-                                exploring_rule_piece_index = rule_piece[0][exploring_index]
-                                if template_data[exploring_rule_piece_index][1] == 'content':
-                                    item_last_content_index = exploring_rule_piece_index
-                                    break
-                                exploring_index -= 1
-
-                        items_text[item_text_index][item_part_index].append({
-                            "type": "content",
-                            "value": ""
-                        })
-                    elif sub_rule_piece[1] == 'caught-tag-file-name':
-                        items_text[item_text_index][item_part_index].append({
-                            "type": "caught-tag-file-name",
-                            "value": ""
-                        })
-                    else:
-                        raise CompositorError.NotSupportedSubtagRuleError(
-                            template_rule.get_template_name(), sub_rule_piece[1]
-                        )
-
-                # if sub_rule content was not present, normalize items_text
-                if len(items_text[item_text_index][1]) == 0:
-                    items_text[item_text_index][1] = items_text[item_text_index][0]
-                    items_text[item_text_index][0] = []
-
-            rule_piece_number += 1
-
+        list_text, item_separator, items_text, tag_list = cls.get_list_layout(content_piece, is_tag_list=True)
         content_data = content_piece.get_content_data()
         index = content_piece.get_index()
 
@@ -1272,6 +1276,9 @@ class Compositor:
         """Apply all the templates through the tag triggers to each tt file in the spine."""
 
         TaggedTexts.set_current_tt_type(TtType.CONTENT)
+        cls._resolved_rules = {}
+        cls._rule_programs = {}
+        cls._list_layouts = {}
 
         for file_info_index, file_info in enumerate(spine.get_pub_info_list()):
             spine.set_current_pub_item_index(file_info_index)
@@ -26,6 +26,33 @@ class ReaderError:
             )
             self.args += (message,)
 
+    class UnknownCacheFormatError(Exception):
+        """The format of the intermediate files is not among the available ones."""
+
+        def __init__(self, cache_format):
+            message = (
+                f"The format '{cache_format}' of the intermediate files is unknown. The available formats are json "
+                "and ttb."
+            )
+            self.args += (message,)
+
+    class InvalidNumberOfJobsError(Exception):
+        """The number of processes that parse the tt files has to be at least 1."""
+
+        def __init__(self, jobs):
+            message = f"The number of jobs has to be an integer of at least 1, not {jobs}."
+            self.args += (message,)
+
+    class StreamingWithJobsError(Exception):
+        """The streaming mode parses the tt files in the current process, so it cannot be used with more jobs."""
+
+        def __init__(self, jobs):
+            message = (
+                f"The streaming mode parses the tt files in the current process, it cannot be used with {jobs} jobs. "
+                "Please use the streaming mode or more jobs."
+            )
+            self.args += (message,)
+
 
 class ParserError:
 
@@ -41,6 +68,8 @@ class ParserError:
 
         def __init__(self, file_name, line_number, current_tag_level, previous_tag_level):
             super().__init__(file_name, line_number)
+            self._current_tag_level = current_tag_level
+            self._previous_tag_level = previous_tag_level
 
             message = (
                 f"Parsing error for {self._file_name} file.\nText line n. {self._line_number} specifies tag level n. "
@@ -49,6 +78,11 @@ class ParserError:
             )
             self.args += (message,)
 
+        def __reduce__(self):
+            """Rebuild the error from its constructor arguments, so it can be passed back by a parsing process."""
+
+            return type(self), (self._file_name, self._line_number, self._current_tag_level, self._previous_tag_level)
+
 
 class CompositorError:
 
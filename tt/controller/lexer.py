@@ -0,0 +1,153 @@
+"""The Tagged Text Lexer that reads the lines of a tt file once and turns them into a stream of typed tokens."""
+
+import re
+from enum import Enum
+from tt.model.regex import Regex
+
+
+class TokenType(Enum):
+    """The type of token produced for a line of a tt file."""
+
+    EMPTY_LINE = 0
+    TEXT = 1
+    HASHTAG = 2
+    HASHTAG_WITHOUT_VALUE = 3
+    COMMENT = 4
+    COMMENT_DELIMITER = 5
+
+
+class Token:
+    """A line of a tt file classified by the lexer. It keeps everything the parser needs to know about the line, so
+    that the line is never examined again with regular expressions."""
+
+    __slots__ = ('type', 'text', 'level', 'tag_name', 'after_tag', 'id_name', 'is_whole_line')
+
+    def __init__(self, token_type: TokenType, text: str):
+        """Create a new token for a stripped text line.
+
+        :param token_type: the type of the token.
+        :param text: the text line without the white chars in the beginning and at the end.
+        """
+        self.type = token_type
+        self.text = text
+        self.level = 0  # the number of # chars of a hashtag line, 0 if the line does not start with a hashtag
+        self.tag_name = ''
+        self.after_tag = ''
+        self.id_name = ''
+        self.is_whole_line = False  # True if a hashtag without value is the only thing in the line
+
+    def is_hashtag_line(self):
+        """Get True if the line starts with a hashtag, that always interrupts a multi-line text."""
+
+        return self.level > 0
+
+    def get_escaped_text(self):
+        """Get the text line without the escape chars in the beginning and at the end."""
+
+        text = self.text
+        if len(text) > 0 and text[0] == '\\':
+            text = text[1:]
+
+        if len(text) > 0 and text[-1] == '\\':
+            text = text[:-1]
+
+        return text
+
+
+class Lexer:
+    """It reads each line of a tt file only once and emits a typed token for it: a hashtag with its level, name, id
+    and the text after it, a hashtag without value, a comment, a comment delimiter, an empty line or a text line.
+    The inline tags are not lines, so they are left to the scanner of the parser."""
+
+    _hashtag = re.compile(Regex.hashtag)
+    _hashtag_no_value = re.compile(Regex.hashtag_no_value)
+    _hashtag_id = re.compile(Regex.hashtag_id)
+    _comment = re.compile(Regex.comment)
+    _comment_delimiter = re.compile(Regex.comment_delimiter)
+
+    @classmethod
+    def tokenize(cls, lines):
+        """Get the token list of the text lines.
+
+        :param lines: the text lines of a tt file.
+        :return: a list with a token for each line.
+        """
+        return [cls.read_line(line) for line in lines]
+
+    @classmethod
+    def read_line(cls, line: str):
+        """Classify a text line producing its token.
+
+        :param line: the text line as it is read from the tt file.
+        :return: the token of the line.
+        """
+        text = line.strip()
+        token_type, level, is_whole_line = cls.read_line_type(text)
+        token = Token(token_type, text)
+        token.level = level
+        token.is_whole_line = is_whole_line
+        if level > 0:
+            match = cls._hashtag.match(text)
+            token.tag_name = text[len(match.group(1)):match.end()]
+            token.after_tag = text[match.end():].strip()
+            if token.after_tag:
+                cls._read_hashtag_id(token)
+
+        if token_type == TokenType.HASHTAG_WITHOUT_VALUE:
+            token.tag_name = text[1:text.index('#', 1)]
+
+        return token
+
+    @classmethod
+    def read_line_type(cls, line: str):
+        """Classify a text line without producing its token. It is the classification of read_line, and alone it is a
+        quick scan of the lines that are read again by the lexer later, as the one that splits a tt file in segments.
+
+        :param line: the text line as it is read from the tt file.
+        :return: a tuple with the token type, the number of # chars of a hashtag line and True if a hashtag without
+        value is the only thing in the line.
+        """
+        text = line.strip()
+        if not text:
+            return TokenType.EMPTY_LINE, 0, False
+
+        if text[0] != '#':
+            return TokenType.TEXT, 0, False
+
+        level = 0
+        match = cls._hashtag.match(text)
+        if match:
+            level = len(match.group(1).rstrip())
+
+        match = cls._hashtag_no_value.match(text)
+        if match:
+            return TokenType.HASHTAG_WITHOUT_VALUE, level, match.end() == len(text)
+
+        if level > 0:
+            return TokenType.HASHTAG, level, False
+
+        if cls._comment.search(text):
+            return TokenType.COMMENT, 0, False
+
+        if cls._comment_delimiter.search(text):
+            return TokenType.COMMENT_DELIMITER, 0, False
+
+        return TokenType.TEXT, 0, False
+
+    @classmethod
+    def _read_hashtag_id(cls, token: Token):
+        """Look for the hashtag id in the text after the tag and remove it from there.
+
+        :param token: the token of a hashtag line with some text after the tag.
+        """
+        match = cls._hashtag_id.search(token.after_tag)
+
+        # If there is an escape \ before the special chars, ignore them
+        if match:
+            if match.start() - 1 >= 0:
+                if token.after_tag[match.start() - 1] == '\\':
+                    match = None
+
+        if match:
+            token.id_name = match.group(0)[1:]
+            token.after_tag = token.after_tag[len(token.id_name) + 1:].strip()
@@ -8,14 +8,25 @@ that use tagged text template files to produce any kind of textual results.
 from tt.controller.parser import Parser
 from tt.controller.compositor import Compositor
 from tt.controller.publisher import Publisher
+from tt.controller.exceptions import ReaderError
 
 
-def write_publication_with_spine(tt_spine_rel_path: str):
+def write_publication_with_spine(
+    tt_spine_rel_path: str, jobs: int = 1, streaming: bool = False, cache_format: str = 'json'
+):
     """Parse the tagged text spine file and all its tt dependencies, then write the publication. The general caught
     exception is the exit point of this method. It can be useful to execute expected final routines.
 
     :param tt_spine_rel_path: the relative path of tt spine file respect to make.py
+    :param jobs: the number of processes that parse the tt files, 1 to parse them in the current process.
+    :param streaming: True to parse the tt files one top-level block at a time, writing the json files while the tt
+    files are read. It cannot be used with more jobs.
+    :param cache_format: the format of the intermediate files in the json folder: 'json', or 'ttb' that is binary and
+    faster to load.
     """
-    Parser.parse_spine_and_all_required_files(tt_spine_rel_path)
+    if type(jobs) is not int or jobs < 1:
+        raise ReaderError.InvalidNumberOfJobsError(jobs)
+
+    Parser.parse_spine_and_all_required_files(tt_spine_rel_path, jobs, streaming, cache_format)
     Compositor.apply_templates()
     Publisher.write_publication()
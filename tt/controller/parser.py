@@ -2,620 +2,754 @@
 
 import os
 import re
-import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from tt.controller.compositor import Compositor
 from tt.controller.exceptions import *
+from tt.controller.lexer import Lexer, TokenType
+from tt.controller.serializer import Serializer, JsonSerializer
 from tt.model.regex import Regex
 from tt.model.spine import spine, Counters
 from tt.model.taggedtexts import Type as TtType
 from tt.model.taggedtexts import TaggedTexts
 from tt.model.templates import Templates
-from tt.model.parsingtree import parsing_tree
+from tt.model.parsingtree import ParsingTree, parsing_tree
+from tt.model.taggedpieces import TaggedPieces
 
 
-class Parser:
-    """It parses the tagged text syntax to produce a list of tagged strings collected in a parsing_tree model."""
+class TextParser:
+    """A plain text of a tt file opened as a list of lines. The object is responsible for parsing the special
+    characters of the tt language and producing its own parsing tree, that can be saved as an intermediate Json file
+    meant to be machine-readable. Each object owns its cursors, so more tt files can be parsed at the same time."""
 
-    class Text:
-        """A plain text of a tt file opened as a list of lines. The class is responsible for parsing the special
-        characters of the tt language and producing an intermediate Json file meant to be machine-readable."""
-
-        _lines = []
-        _current_line_index = -1
-        _current_line = ''
-        _after_tag_line = ''
-        _current_text_value = ''
-        _previous_level = 0
-        _current_level = 1
-        _chunks = []
-        _previous_parents = 0
-        _parent_stack = []
-        _hashtag_id_name_to_apply = ''
-        _new_line_char = ''
-
-        @classmethod
-        def reset_cursors(cls):
-            """Reset the cursors related to the indexes to walking through the text."""
-
-            cls.start_line()
-
-        @classmethod
-        def reset_tag_context(cls):
-            """Reset the context of a tag that consists in information about the tag."""
-
-            cls.current_tag = ''
-            cls._current_text_value = ''
-            cls._previous_level = 0
-            cls._previous_parents = 0
-            cls._parent_stack.clear()
-
-        @classmethod
-        def start_line(cls):
-            """Set the index of the text to the first line, if a line is available."""
-
-            if len(cls._lines) > 0:
-                cls._current_line_index = 0
-                cls._current_line = cls._lines[0].strip()
-            else:
-                cls._current_line_index = -1
+    version = 1  # to increase when the same text gives different parsed data, so the saved json files are not used
+    _open_inline_tag = re.compile(Regex.open_inline_tag)
+    _closed_inline_tag = re.compile(Regex.closed_inline_tag)
+    _inline_hashtag_or_empty_line = re.compile('(' + Regex.hashtag_no_value + ')|\v')
 
-        @classmethod
-        def next_line(cls):
-            """Set the index of the text to the next line, if available, and read its content."""
+    def __init__(self, tt_file_abs_path: str = '', first_line_index: int = 0):
+        """Create a new parser for the text of a tt file.
 
-            cls._current_line_index += 1
-            if cls._current_line_index < len(cls._lines):
-                cls._current_line = cls._lines[cls._current_line_index].strip()
-            else:
-                cls._current_line_index = -1
-                cls._current_line = ''
+        :param tt_file_abs_path: the absolute path of the parsed tt file, used to report the errors.
+        :param first_line_index: the index of the first parsed line in the tt file, when only a segment of the file is
+        parsed. It is used to report the errors.
+        """
+        self._tt_file_abs_path = tt_file_abs_path
+        self._first_line_index = first_line_index
+        self.reset_parsing_state()
+
+    def reset_parsing_state(self):
+        """Reset all the state of the parser with a new empty parsing tree."""
+
+        self._parsing_tree = ParsingTree()
+        self._tokens = []
+        self._current_line_index = -1
+        self._current_token = None
+        self._current_line = ''
+        self._after_tag_line = ''
+        self._current_text_value = ''
+        self._previous_level = 0
+        self._current_level = 1
+        self._chunks = []
+        self._previous_parents = 0
+        self._parent_stack = []
+        self._hashtag_id_name_to_apply = ''
+
+    def parse(self, lines):
+        """Parse the text lines of a tt file into a new parsing tree. Each line is read only once by the lexer, then
+        the parser walks through the produced tokens.
+
+        :param lines: the text lines of a tt file.
+        :return: the parsing tree with the parsed data.
+        """
+        return self.parse_tokens(Lexer.tokenize(lines))
 
-        @classmethod
-        def is_there_a_current_line(cls):
-            """Get the state of the index if there is or not a new current line.
+    def parse_tokens(self, tokens: list):
+        """Parse the tokens produced by the lexer for the text lines of a tt file into a new parsing tree.
 
-            :return: True or False if a new current line is present or not.
-            """
+        :param tokens: the tokens of the text lines.
+        :return: the parsing tree with the parsed data.
+        """
+        self.reset_parsing_state()
+        self._tokens = tokens
+        self.reset_cursors()
+        while self.is_there_a_current_line():
+            if self.is_current_line_not_empty():
+                self.look_for_hashtag_without_value() or \
+                    self.look_for_hashtag() or \
+                    self.look_for_comment() or \
+                    self.look_for_text_without_tag()
+                self.reset_tag_context()
+            self.next_line()
 
-            if cls._current_line_index < 0 or cls._current_line_index >= len(cls._lines):
-                return False
-            else:
-                return True
+        return self._parsing_tree
 
-        @classmethod
-        def is_current_line_not_empty(cls):
-            """Get the state of a line if it is or not empty.
+    def get_parsing_tree(self):
+        """Get the parsing tree with the data of the last parsed text."""
 
-            :return: True or False if the current line is empty or not.
-            """
+        return self._parsing_tree
 
-            return bool(cls._current_line)
+    @classmethod
+    def iterate_parsed_pieces(cls, lines, tt_file_abs_path: str = ''):
+        """Parse the text lines of a tt file one segment at a time and yield the tagged pieces as soon as their segment
+        is complete, with the piece IDs they would have in the parsing tree of the whole file. Only the lines and the
+        pieces of the current segment are kept in memory.
+
+        :param lines: an iterable of the text lines of a tt file, like an open file.
+        :param tt_file_abs_path: the absolute path of the parsed tt file, used to report the errors.
+        :return: a generator of the tagged pieces.
+        """
+        shift = 0
+        for first_line_index, tokens in cls.iterate_segments(lines):
+            parsed_tree = TextParser(tt_file_abs_path, first_line_index).parse_tokens(tokens)
+            parsed_tree.shift_piece_ids(shift)
+            shift += parsed_tree.get_number_of_parsed_pieces()
+            yield from parsed_tree.get_json_data()
 
-        @classmethod
-        def strip_escape_char_from_beginning_and_end_of_line(cls, line: str):
-            """Remove the escape char in the beginning and at the end of the line.
+    @classmethod
+    def get_segment_ranges(cls, lines, lines_per_segment: int):
+        """Split the text lines of a tt file in segments that can be parsed separately and then merged. The lines are
+        only classified, not lexed, because each segment is lexed again by the parser that takes it.
 
-            :param line: the line where to check the escape chars.
-            :return: the line edited.
-            """
-            if len(line) > 0 and line[0] == '\\':
-                line = line[1:]
+        :param lines: the text lines of a tt file.
+        :param lines_per_segment: the minimum number of lines of a segment, except the last one.
+        :return: a list of pairs with the index of the first line of a segment and the index after its last line.
+        """
+        segment_ranges = []
+        segment_start = 0
+        index = -1
+        for index, (line, is_segment_start) in enumerate(
+                cls._iterate_segment_starts(lines, Lexer.read_line_type, lines_per_segment)):
+            if is_segment_start:
+                segment_ranges.append((segment_start, index))
+                segment_start = index
 
-            if len(line) > 0 and line[-1] == '\\':
-                line = line[:-1]
+        if index >= 0:
+            segment_ranges.append((segment_start, index + 1))
 
-            return line
+        return segment_ranges
 
-        @classmethod
-        def look_for_hashtag_without_value(cls):
-            """Look for a hashtag without value in a text line.
+    @classmethod
+    def iterate_segments(cls, lines, lines_per_segment: int = 0):
+        """Read the text lines one by one and yield the segments of the text that can be parsed separately and then
+        merged, with the tokens of their lines.
 
-            :return: True or False if a hashtag without value is found or not.
-            """
+        :param lines: an iterable of the text lines of a tt file.
+        :param lines_per_segment: the minimum number of lines of a segment, except the last one.
+        :return: a generator of pairs with the index of the first line of a segment and the tokens of its lines.
+        """
+        segment_start = 0
+        segment_tokens = []
+        for index, (token, is_segment_start) in enumerate(cls._iterate_segment_starts(
+                map(Lexer.read_line, lines), lambda t: (t.type, t.level, t.is_whole_line), lines_per_segment)):
+            if is_segment_start:
+                yield segment_start, segment_tokens
+                segment_start = index
+                segment_tokens = []
 
-            # Case 1: only a double hashtag
-            match = re.search('^' + Regex.hashtag_no_value + '$', cls._current_line)
-            if match:
-                tag_name = match.group(0)[1:-1]
-                parsing_tree.append_tagged_piece('', tag_name)
-                return True
+            segment_tokens.append(token)
 
-            # Case 2: full line that starts with double hashtag
-            match = re.search('^' + Regex.hashtag_no_value, cls._current_line)
-            if match:
-                cls.pick_multi_text_lines(text_to_prepend=cls._current_line)
-                cls.evaluate_presence_of_inline_tags(cls._current_text_value, '')
-                return True
-
-        @classmethod
-        def look_for_hashtag(cls):
-            """Try to look for a hashtag in a text line managing exceptions and errors.
-
-            :return: True or False if a hashtag is found or not.
-            """
-            try:
-                return cls.try_to_look_for_hashtag()
-
-            except Exception as e:
-                raise e
-
-        @classmethod
-        def try_to_look_for_hashtag(cls):
-            """Look for a hashtag in a text line taking all the implied following lines.
-
-            :return: True or False if a hashtag is found or not.
-            """
-            search_start = cls._current_line_index
-            search_steps = 0
-
-            while search_start + search_steps < len(cls._lines):
-                cls._current_text_value = ''
-                forward_line = cls._lines[search_start + search_steps].strip()
-
-                match_hashtag = re.search('^' + Regex.hashtag, forward_line)
-                if match_hashtag:
-                    tag_name = match_hashtag.group(0)
-
-                    # the level of the tag is given by the number of # chars in the tag name
-                    tag_level = len(tag_name)
-                    tag_name = tag_name.lstrip('#')
-                    tag_level -= len(tag_name)
-
-                    # if this line has a top-level tag, the current processed hashtag is finished
-                    if tag_level == 1 and search_steps > 0:
-                        cls._previous_level = 0
-                        break
-
-                    # it checks the next level is introduced gradually (#, ##, ###, etc.)
-                    if tag_level - cls._previous_level > 1:
-                        raise ParserError.SkippedDeeperTagLevelError(
-                            spine.paths.get_current_tt_file_abs_path(),
-                            search_start + search_steps + 1,
-                            tag_level,
-                            cls._previous_level
-                        )
+        if segment_tokens:
+            yield segment_start, segment_tokens
 
-                    if tag_level < cls._previous_level:
-                        cls._parent_stack = cls._parent_stack[:tag_level - 1]
+    @classmethod
+    def _iterate_segment_starts(cls, lines, get_line_type, lines_per_segment: int):
+        """Follow the blocks of the text lines and tell which lines start a new segment. A segment can only start with
+        a top-level tag that begins a new block of the text, so not inside a comment block or inside the block of
+        another tag, because that tag resets the whole context of the parser. The blocks follow the same order of the
+        checks done by the parser.
+
+        :param lines: an iterable of the text lines, or of their tokens.
+        :param get_line_type: the function that gives the token type, the level and the whole-line flag of a line.
+        :param lines_per_segment: the minimum number of lines of a segment, except the last one.
+        :return: a generator of pairs with a line and True or False if the line starts a new segment or not.
+        """
+        block_type = None
+        segment_length = 0
+        for line in lines:
+            token_type, level, is_whole_line = get_line_type(line)
+            is_segment_start = False
+
+            # A comment block ends with its closing delimiter, a tag takes its subtags until the next top-level tag,
+            # a text takes the next lines until the next tag
+            if block_type == TokenType.COMMENT_DELIMITER:
+                if token_type == TokenType.COMMENT_DELIMITER:
+                    block_type = None
+
+            elif not (block_type == TokenType.HASHTAG and level != 1 or block_type == TokenType.TEXT and level == 0):
+                # This line starts a new block
+                if token_type == TokenType.HASHTAG and level == 1 and segment_length > 0 and \
+                        segment_length >= lines_per_segment:
+                    is_segment_start = True
+                    segment_length = 0
+
+                if token_type in [TokenType.EMPTY_LINE, TokenType.COMMENT] or is_whole_line:
+                    block_type = None
+                elif token_type in [TokenType.HASHTAG, TokenType.COMMENT_DELIMITER]:
+                    block_type = token_type
+                else:
+                    block_type = TokenType.TEXT
 
-                    elif tag_level == cls._previous_level:
-                        cls._parent_stack = cls._parent_stack[:-1]
+            segment_length += 1
+            yield line, is_segment_start
 
-                    cls._after_tag_line = forward_line[len(tag_name) + tag_level:].strip()
+    def reset_cursors(self):
+        """Reset the cursors related to the indexes to walking through the text."""
 
-                    # between the hashes ## and the tag name there could be a space,
-                    # but you can remove it after the calculation for the _after_tag_line
-                    tag_name = tag_name.lstrip()
+        self.start_line()
 
-                    if cls._after_tag_line:
-                        cls.look_for_hashtag_id()
-                        if cls._after_tag_line:
-                            cls._after_tag_line += '\n'
+    def reset_tag_context(self):
+        """Reset the context of a tag that consists in information about the tag."""
 
-                    cls._current_level = tag_level
-                    cls.pick_multi_text_lines(cls._after_tag_line)
-                    search_steps = cls._current_line_index - search_start
+        self.current_tag = ''
+        self._current_text_value = ''
+        self._previous_level = 0
+        self._previous_parents = 0
+        self._parent_stack.clear()
 
-                    cls._current_line_index = search_start + search_steps + 1
-                    current_parent_id = len(parsing_tree.get_json_data())
-                    cls._parent_stack.append(current_parent_id)
+    def start_line(self):
+        """Set the index of the text to the first line, if a line is available."""
 
-                    parsing_tree.append_tagged_piece([current_parent_id + 1], tag_name)
-                    id_of_piece_with_id_name = 0
-                    if cls._hashtag_id_name_to_apply:
-                        id_of_piece_with_id_name = parsing_tree.get_number_of_parsed_pieces() - 1
+        if len(self._tokens) > 0:
+            self._current_line_index = 0
+            self._current_token = self._tokens[0]
+            self._current_line = self._current_token.text
+        else:
+            self._current_line_index = -1
 
-                    cls.evaluate_presence_of_inline_tags(cls._current_text_value)
-                    search_steps = cls._current_line_index - search_start - 1
+    def next_line(self):
+        """Set the index of the text to the next line, if available, and read its content."""
 
-                    if tag_level > 1:
-                        grandparent_id = cls._parent_stack[tag_level - 2]
-                        grandparent_value = parsing_tree.get_value_of_tagged_piece(grandparent_id)
-                        if isinstance(grandparent_value, list):
-                            if current_parent_id not in grandparent_value:
-                                parsing_tree.append_id_to_tagged_piece_value(grandparent_id, current_parent_id)
+        self._current_line_index += 1
+        if self._current_line_index < len(self._tokens):
+            self._current_token = self._tokens[self._current_line_index]
+            self._current_line = self._current_token.text
+        else:
+            self._current_line_index = -1
+            self._current_token = None
+            self._current_line = ''
 
-                    if cls._hashtag_id_name_to_apply:
-                        id_of_id_name = parsing_tree.get_number_of_parsed_pieces()
-                        parsing_tree.append_id_to_tagged_piece_value(id_of_piece_with_id_name, id_of_id_name)
-                        parsing_tree.append_tagged_piece(cls._hashtag_id_name_to_apply, '_id_name')
-                        cls._hashtag_id_name_to_apply = ''
+    def is_there_a_current_line(self):
+        """Get the state of the index if there is or not a new current line.
 
-                    cls._previous_level = tag_level
-                else:
+        :return: True or False if a new current line is present or not.
+        """
+
+        if self._current_line_index < 0 or self._current_line_index >= len(self._tokens):
+            return False
+        else:
+            return True
+
+    def is_current_line_not_empty(self):
+        """Get the state of a line if it is or not empty.
+
+        :return: True or False if the current line is empty or not.
+        """
+
+        return bool(self._current_line)
+
+    def look_for_hashtag_without_value(self):
+        """Look for a hashtag without value in a text line.
+
+        :return: True or False if a hashtag without value is found or not.
+        """
+        if self._current_token.type != TokenType.HASHTAG_WITHOUT_VALUE:
+            return False
+
+        # Case 1: only a double hashtag
+        if self._current_token.is_whole_line:
+            self._parsing_tree.append_tagged_piece('', self._current_token.tag_name)
+            return True
+
+        # Case 2: full line that starts with double hashtag
+        self.pick_multi_text_lines(text_to_prepend=self._current_line)
+        self.evaluate_presence_of_inline_tags(self._current_text_value, '')
+        return True
+
+    def look_for_hashtag(self):
+        """Try to look for a hashtag in a text line managing exceptions and errors.
+
+        :return: True or False if a hashtag is found or not.
+        """
+        try:
+            return self.try_to_look_for_hashtag()
+
+        except Exception as e:
+            raise e
+
+    def try_to_look_for_hashtag(self):
+        """Look for a hashtag in a text line taking all the implied following lines.
+
+        :return: True or False if a hashtag is found or not.
+        """
+        search_start = self._current_line_index
+        search_steps = 0
+
+        while search_start + search_steps < len(self._tokens):
+            self._current_text_value = ''
+            forward_token = self._tokens[search_start + search_steps]
+
+            if forward_token.is_hashtag_line():
+                tag_name = forward_token.tag_name
+
+                # the level of the tag is given by the number of # chars in the tag name
+                tag_level = forward_token.level
+
+                # if this line has a top-level tag, the current processed hashtag is finished
+                if tag_level == 1 and search_steps > 0:
+                    self._previous_level = 0
                     break
-                search_steps += 1
 
-            if search_steps > 0:
-                cls._current_line_index = search_start + search_steps - 1
-                return True
-            else:
-                return False
+                # it checks the next level is introduced gradually (#, ##, ###, etc.)
+                if tag_level - self._previous_level > 1:
+                    raise ParserError.SkippedDeeperTagLevelError(
+                        self._tt_file_abs_path,
+                        self._first_line_index + search_start + search_steps + 1,
+                        tag_level,
+                        self._previous_level
+                    )
 
-        @classmethod
-        def look_for_hashtag_id(cls):
-            """Look for the hashtag id in _after_tag_line.
+                if tag_level < self._previous_level:
+                    self._parent_stack = self._parent_stack[:tag_level - 1]
 
-            :return: True or False if the hashtag id is found or not.
-            """
+                elif tag_level == self._previous_level:
+                    self._parent_stack = self._parent_stack[:-1]
 
-            match = re.search(Regex.hashtag_id, cls._after_tag_line)
+                self._after_tag_line = forward_token.after_tag
+                if forward_token.id_name:
+                    self._hashtag_id_name_to_apply = forward_token.id_name
 
-            # If there is an escape \ before the special chars, ignore them
-            if match:
-                if match.start() - 1 >= 0:
-                    if cls._after_tag_line[match.start() - 1] == '\\':
-                        match = None
+                if self._after_tag_line:
+                    self._after_tag_line += '\n'
 
-            if match:
-                cls._hashtag_id_name_to_apply = match.group(0)[1:]
-                cls._after_tag_line = cls._after_tag_line[len(cls._hashtag_id_name_to_apply) + 1:].strip()
-                return True
-            else:
-                return False
+                self._current_level = tag_level
+                self.pick_multi_text_lines(self._after_tag_line)
+                search_steps = self._current_line_index - search_start
 
-        @classmethod
-        def look_for_comment(cls):
-            """Look for a comment in a text line.
+                self._current_line_index = search_start + search_steps + 1
+                current_parent_id = self._parsing_tree.get_number_of_parsed_pieces()
+                self._parent_stack.append(current_parent_id)
 
-            :return: True or False if a comment is found or not.
-            """
+                self._parsing_tree.append_tagged_piece([current_parent_id + 1], tag_name)
 
-            match = re.search(Regex.comment, cls._current_line)
-            if match:
-                return True
+                # The parent receives the ID before the pieces of the text are appended, so its IDs stay in order
+                if tag_level > 1:
+                    grandparent_id = self._parent_stack[tag_level - 2]
+                    grandparent_value = self._parsing_tree.get_value_of_tagged_piece(grandparent_id)
+                    if isinstance(grandparent_value, list):
+                        if current_parent_id not in grandparent_value:
+                            self._parsing_tree.append_id_to_tagged_piece_value(grandparent_id, current_parent_id)
 
-            match = re.search(Regex.comment_delimiter, cls._current_line)
-            if match:
-                search_start = cls._current_line_index
-                search_steps = 1
-                while search_start + search_steps < len(cls._lines):
-                    match = re.search(Regex.comment_delimiter, cls._lines[search_start + search_steps].strip())
-                    if match:
-                        break
-                    search_steps += 1
-
-                cls._current_line_index += search_steps
-                return True
-            else:
-                return False
+                id_of_piece_with_id_name = 0
+                if self._hashtag_id_name_to_apply:
+                    id_of_piece_with_id_name = self._parsing_tree.get_number_of_parsed_pieces() - 1
+
+                self.evaluate_presence_of_inline_tags(self._current_text_value)
+                search_steps = self._current_line_index - search_start - 1
 
-        @classmethod
-        def look_for_text_without_tag(cls):
-            """Look for text without any tag in the next text lines.
+                if self._hashtag_id_name_to_apply:
+                    id_of_id_name = self._parsing_tree.get_number_of_parsed_pieces()
+                    self._parsing_tree.append_id_to_tagged_piece_value(id_of_piece_with_id_name, id_of_id_name)
+                    self._parsing_tree.append_tagged_piece(self._hashtag_id_name_to_apply, '_id_name')
+                    self._hashtag_id_name_to_apply = ''
 
-            :return: True as a confirmation the search has been done.
-            """
+                self._previous_level = tag_level
+            else:
+                break
+            search_steps += 1
 
-            cls.pick_multi_text_lines(cls._current_line)
-            next_piece_id = parsing_tree.get_number_of_parsed_pieces() + 1
-            parsing_tree.append_tagged_piece([next_piece_id], '')
-            cls.evaluate_presence_of_inline_tags(cls._current_text_value)
+        if search_steps > 0:
+            self._current_line_index = search_start + search_steps - 1
             return True
+        else:
+            return False
 
-        @classmethod
-        def pick_multi_text_lines(cls, text_to_prepend: str = ''):
-            """Pick multi text lines until to find a new tag.
+    def look_for_comment(self):
+        """Look for a comment in a text line.
 
-            :param text_to_prepend: if a previous line started with a tag and there is some text after the tag, this
-            parameter can prepend the text after the tag to the collected multi lines text.
-            """
-            search_start = cls._current_line_index
+        :return: True or False if a comment is found or not.
+        """
+
+        if self._current_token.type == TokenType.COMMENT:
+            return True
+
+        if self._current_token.type == TokenType.COMMENT_DELIMITER:
+            search_start = self._current_line_index
             search_steps = 1
-            while search_start + search_steps < len(cls._lines):
-                forward_line = cls._lines[search_start + search_steps]
-                match = re.search('^' + Regex.hashtag, forward_line.lstrip())
-                # TODO BUG currently this cycle that picks lines it is not ready to skip the comments
-                if match:
+            while search_start + search_steps < len(self._tokens):
+                if self._tokens[search_start + search_steps].type == TokenType.COMMENT_DELIMITER:
                     break
-                else:
-                    line_end_char = '\n'
-                    forward_line = forward_line.strip()
+                search_steps += 1
 
-                    if forward_line == '':
-                        if len(cls._current_text_value) > 0 and cls._current_text_value[-1] == '\n':
-                            cls._current_text_value = cls._current_text_value[0:-1]
-                        line_end_char = '\v'
+            self._current_line_index += search_steps
+            return True
+        else:
+            return False
 
-                    cls._current_text_value += (
-                        cls.strip_escape_char_from_beginning_and_end_of_line(forward_line) + line_end_char
-                    )
+    def look_for_text_without_tag(self):
+        """Look for text without any tag in the next text lines.
 
-                search_steps += 1
+        :return: True as a confirmation the search has been done.
+        """
+
+        self.pick_multi_text_lines(self._current_line)
+        next_piece_id = self._parsing_tree.get_number_of_parsed_pieces() + 1
+        self._parsing_tree.append_tagged_piece([next_piece_id], '')
+        self.evaluate_presence_of_inline_tags(self._current_text_value)
+        return True
+
+    def pick_multi_text_lines(self, text_to_prepend: str = ''):
+        """Pick multi text lines until to find a new tag. The lines are collected as a list of fragments joined only
+        once at the end, so the time to pick a block of text grows linearly with the number of its lines.
 
-            cls._current_line_index = search_start + search_steps - 1
-            if (len(text_to_prepend) > 0 and len(cls._current_text_value) > 0 and
-                    cls._current_text_value[0] == '\v' and text_to_prepend[-1] == '\n'):
+        :param text_to_prepend: if a previous line started with a tag and there is some text after the tag, this
+        parameter can prepend the text after the tag to the collected multi lines text.
+        """
+        fragments = []
+        if self._current_text_value:
+            fragments.append(self._current_text_value)
+
+        search_start = self._current_line_index
+        search_steps = 1
+        while search_start + search_steps < len(self._tokens):
+            forward_token = self._tokens[search_start + search_steps]
+            # TODO BUG currently this cycle that picks lines it is not ready to skip the comments
+            if forward_token.is_hashtag_line():
+                break
+            elif forward_token.type == TokenType.EMPTY_LINE:
+                self._remove_last_new_line_char(fragments)
+                fragments.append('\v')
+            else:
+                fragments.append(forward_token.get_escaped_text() + '\n')
+
+            search_steps += 1
+
+        self._current_line_index = search_start + search_steps - 1
+        if len(text_to_prepend) > 0:
+            if len(fragments) > 0 and fragments[0][0] == '\v' and text_to_prepend[-1] == '\n':
                 text_to_prepend = text_to_prepend[0:-1]
-            cls._current_text_value = text_to_prepend + cls._current_text_value
+            fragments.insert(0, text_to_prepend)
 
-            if not cls._new_line_char:
-                cls.detect_new_line_char()
+        # The tt files are read in text mode, so every new line char is already a standard \n char
+        value = ''.join(self._collapse_vertical_tabs(fragments))
+        if len(value) > 0 and value[-1] == '\n':
+            value = value[0:-1]
 
-            if cls._new_line_char:
-                # Use a standard new line char in the parsed text
-                if cls._new_line_char != '\n':
-                    cls._current_text_value = re.sub(cls._new_line_char, '\n', cls._current_text_value)
+        # If the current value is made of only white chars, set an empty string
+        if value.strip() == '':
+            value = ''
 
-                # 2 or more consecutive vertical tab chars have to be substituted with 1 vertical tab char \v
-                cls._current_text_value = re.sub('\v{2,}', '\v', cls._current_text_value)
+        self._current_text_value = value
 
-                if len(cls._current_text_value) > 0 and cls._current_text_value[-1] == '\n':
-                    cls._current_text_value = cls._current_text_value[0:-1]
+    def _remove_last_new_line_char(self, fragments: list):
+        """Remove the new line char at the end of the collected fragments, if present.
 
-            # If the current value is made of only white chars, set an empty string
-            if cls._current_text_value.strip() == '':
-                cls._current_text_value = ''
+        :param fragments: the list of non-empty text fragments collected so far.
+        """
+        if len(fragments) > 0 and fragments[-1][-1] == '\n':
+            fragments[-1] = fragments[-1][0:-1]
+            if not fragments[-1]:
+                fragments.pop()
 
-        @classmethod
-        def detect_new_line_char(cls):
-            n_char_index = cls._current_text_value.find('\n')
-            r_char_index = cls._current_text_value.find('\r')
+    def _collapse_vertical_tabs(self, fragments: list):
+        """Substitute 2 or more consecutive vertical tab chars with 1 vertical tab char, also when the vertical tab
+        chars belong to adjacent fragments.
 
-            if n_char_index != -1 and r_char_index == -1:
-                cls._new_line_char = '\n'
+        :param fragments: the list of text fragments.
+        :return: the list of fragments without consecutive vertical tab chars.
+        """
+        normalized = []
+        ends_with_vertical_tab = False
+        for fragment in fragments:
+            if '\v\v' in fragment:
+                fragment = re.sub('\v{2,}', '\v', fragment)
 
-            elif r_char_index != -1 and n_char_index == -1:
-                cls._new_line_char = '\r'
+            if ends_with_vertical_tab and fragment[:1] == '\v':
+                fragment = fragment[1:]
 
-            elif r_char_index != -1 and n_char_index != -1:
-                if r_char_index > n_char_index:
-                    cls._new_line_char = '\n\r'
-                else:
-                    cls._new_line_char = '\r\n'
+            if fragment:
+                normalized.append(fragment)
+                ends_with_vertical_tab = fragment[-1] == '\v'
 
-        @classmethod
-        def give_next_text_to_tag(cls, tag_name: str, after_tag: str):
-            """Give to the current tag the next text processed to find inline tags.
+        return normalized
 
-            :param tag_name: the name of the current tag.
-            :param after_tag: the part of text line after the found tag.
-            """
-            if cls._current_line_index >= len(cls._lines):
-                parsing_tree.append_tagged_piece('', tag_name)
-                return
+    def give_next_text_to_tag(self, tag_name: str, after_tag: str):
+        """Give to the current tag the next text processed to find inline tags.
 
-            cls._current_text_value = cls._lines[cls._current_line_index].strip()
-            match = re.search(Regex.not_normal_text, cls._current_text_value)
+        :param tag_name: the name of the current tag.
+        :param after_tag: the part of text line after the found tag.
+        """
+        if self._current_line_index >= len(self._tokens):
+            self._parsing_tree.append_tagged_piece('', tag_name)
+            return
+
+        self._current_text_value = self._tokens[self._current_line_index].text
+        match = re.search(Regex.not_normal_text, self._current_text_value)
+        if match:
+            self._parsing_tree.append_tagged_piece('', tag_name)
+            return
+
+        lines = [self._current_text_value]
+        search_start = self._current_line_index
+        search_steps = 1
+
+        while search_start + search_steps < len(self._tokens):
+            forward_line = self._tokens[search_start + search_steps].text
+            match = re.search(Regex.not_normal_text, forward_line)
             if match:
-                parsing_tree.append_tagged_piece('', tag_name)
-                return
+                break
+            else:
+                lines.append(forward_line)
+            search_steps += 1
 
-            search_start = cls._current_line_index
-            search_steps = 1
+        self._current_line_index += search_steps - 1
+        self._current_text_value = after_tag + '\n'.join(lines)
+        self._current_text_value = self._current_text_value.rstrip().replace('\n', '\\n')
+        self._previous_parents = 0
+        self.evaluate_presence_of_inline_tags(self._current_text_value, tag_name)
 
-            while search_start + search_steps < len(cls._lines):
-                forward_line = cls._lines[search_start + search_steps].strip()
-                match = re.search(Regex.not_normal_text, forward_line)
-                if match:
-                    break
-                else:
-                    cls._current_text_value += '\n' + forward_line
-                search_steps += 1
+    def evaluate_presence_of_inline_tags(self, line: str, tag_name: str = ''):
+        """Evaluate if a line is divided by inline tags and use a list of child indexes to refer to the line pieces
+        or else use the plain line.
 
-            cls._current_line_index += search_steps - 1
-            cls._current_text_value = after_tag + cls._current_text_value
-            cls._current_text_value = cls._current_text_value.rstrip().replace('\n', '\\n')
-            cls._previous_parents = 0
-            cls.evaluate_presence_of_inline_tags(cls._current_text_value, tag_name)
-
-        @classmethod
-        def evaluate_presence_of_inline_tags(cls, line: str, tag_name: str = ''):
-            """Evaluate if a line is divided by inline tags and use a list of child indexes to refer to the line pieces
-            or else use the plain line.
-
-            :param line: the line to evaluate.
-            :param tag_name: if available, the current tag name that can receive the line (divided or not).
-            """
-
-            # If vertical tab char is present in a content of a tag of level 2 or more, that char splits the content
-            # into a first and a second part. The first part will be assigned to the current tag, the second part will
-            # be assigned as a new child of the previous parent.
-            extra_content = []
-            if cls._current_level > 1:
-                if '\v' in line:
-                    extra_content = line.split('\v', maxsplit=1)
-                    if len(extra_content) == 2:
-                        line = extra_content[0] + '\v'
-                        extra_content = extra_content[1:]
-
-            # If a tag applies to multiple tagged text strings, there will be an array of indexes
-            # Those indexes refer to the future append strings with only 1 level of depth
-            parent_position = parsing_tree.get_number_of_parsed_pieces()
-            child_indexes = cls.look_for_inline_tags(line)
-            if child_indexes:
-                parsing_tree.insert_parsed_piece(parent_position, child_indexes, tag_name)
+        :param line: the line to evaluate.
+        :param tag_name: if available, the current tag name that can receive the line (divided or not).
+        """
+
+        # If vertical tab char is present in a content of a tag of level 2 or more, that char splits the content
+        # into a first and a second part. The first part will be assigned to the current tag, the second part will
+        # be assigned as a new child of the previous parent.
+        extra_content = []
+        if self._current_level > 1:
+            if '\v' in line:
+                extra_content = line.split('\v', maxsplit=1)
+                if len(extra_content) == 2:
+                    line = extra_content[0] + '\v'
+                    extra_content = extra_content[1:]
+
+        # If a tag applies to multiple tagged text strings, its value will be the list of their indexes
+        child_indexes = self.look_for_inline_tags(line, tag_name)
+        if not child_indexes:
+            if self._current_text_value or tag_name:
+                self._parsing_tree.append_tagged_piece(line, tag_name)
             else:
-                if cls._current_text_value or tag_name:
-                    parsing_tree.append_tagged_piece(line, tag_name)
-                else:
-                    parsing_tree.remove_first_piece_id_from_piece_value(cls._parent_stack[-1])
-
-            if len(extra_content) > 0:
-                extra_content_text = '\n\n'.join(extra_content)
-                child_position = parsing_tree.get_number_of_parsed_pieces()
-                child_indexes = cls.look_for_inline_tags(extra_content_text)
-                if child_indexes:
-                    child_indexes = [index - 1 for index in child_indexes]
-                    parsing_tree.append_id_to_tagged_piece_value(cls._parent_stack[-2], child_indexes)
-                else:
-                    if extra_content_text:
-                        parsing_tree.append_id_to_tagged_piece_value(cls._parent_stack[-2], child_position)
-                        parsing_tree.append_tagged_piece([extra_content_text, ''])
-
-        @classmethod
-        def look_for_inline_tags(cls, line: str):
-            """Look for inline tags in a text line.
-
-            :param line: the line where to look for inline tags.
-            :return: a list of IDs of the new strings found after the processing of the inline tags. If the line is not
-            split, False is returned.
-            """
-            child_ids = []
-
-            # The chunk list needs to be a new object for every sub-line
-            chunks = cls.split_line_into_chunks(line).copy()
-            if len(chunks) < 2:
-                return False
+                self._parsing_tree.remove_first_piece_id_from_piece_value(self._parent_stack[-1])
+
+        if len(extra_content) > 0:
+            extra_content_text = '\n\n'.join(extra_content)
+            child_position = self._parsing_tree.get_number_of_parsed_pieces()
+            child_indexes = self.look_for_inline_tags(extra_content_text)
+            if child_indexes:
+                self._parsing_tree.append_id_to_tagged_piece_value(self._parent_stack[-2], child_indexes)
             else:
-                cls._previous_parents += 1
-                i = 0
-                while i < len(chunks):
-                    child_ids.append(parsing_tree.get_number_of_parsed_pieces() + 1)
-                    if re.search('^' + Regex.open_inline_tag + '$', chunks[i]):
-                        sub_line = chunks[i + 1]
-                        tag_name = chunks[i][2:-2]
-                        parents_before_nesting = cls._previous_parents
-                        cls.evaluate_presence_of_inline_tags(sub_line, tag_name)
-                        cls._previous_parents = parents_before_nesting
-                        i += 3
-                    elif re.search('^' + Regex.hashtag_no_value + '$', chunks[i]):
-                        tag_name = chunks[i][1:-1]
-                        parsing_tree.append_tagged_piece('', tag_name)
-                        i += 1
-                    elif re.search('^\v$', chunks[i]):
-                        tag_name = '_empty_line'
-                        parsing_tree.append_tagged_piece('', tag_name)
-                        i += 1
-                    else:
-                        parsing_tree.append_tagged_piece(chunks[i], '')
-                        i += 1
-                return child_ids
-
-        @classmethod
-        def split_line_into_chunks(cls, line: str):
-            """Split a text line in substrings according to the inline tags found and the double new line used.
-
-            :param line: the line where to look for inline tags.
-            :return: a list of substrings in which the line has been split.
-            """
-            regex = Regex
-            cls._chunks.clear()
-            parsing_progression_index = 0
-            # open_tag_start_index = 0
-            # open_tag_end_index = 0
-            closed_tag_start_index = 0
-            closed_tag_end_index = 0
-
-            while parsing_progression_index < len(line):
-                number_of_nested_open_tags = 0
-                closed_tag_match = False
-                main_open_tag_match = re.search(regex.open_inline_tag, line[parsing_progression_index:])
-
-                # If there is an escape \ before the special chars, ignore them
-                if main_open_tag_match:
-                    if main_open_tag_match.start() - 1 >= 0:
-                        if line[main_open_tag_match.start() - 1] == '\\':
-                            main_open_tag_match = None
-
-                if main_open_tag_match:
-                    open_tag_start_index = parsing_progression_index + main_open_tag_match.start()
-                    if closed_tag_end_index != open_tag_start_index:
-                        cls.look_for_inline_hashtag_without_value(line[closed_tag_end_index:open_tag_start_index])
-                    open_tag_end_index = parsing_progression_index + main_open_tag_match.end()
-                    parsing_progression_index = open_tag_end_index
-
-                    while number_of_nested_open_tags >= 0:
-                        closed_tag_match = re.search(regex.closed_inline_tag, line[parsing_progression_index:])
-                        if not closed_tag_match:
-                            parsing_progression_index = len(line)
-                        else:
-                            nested_open_tag_match = re.search(regex.open_inline_tag, line[parsing_progression_index:])
-                            if nested_open_tag_match:
-                                if nested_open_tag_match.start() < closed_tag_match.start():
-                                    # Each opening tag actually includes a closing tag
-                                    # So the end of the found closing tag is the end of the opening tag
-                                    # Moreover, it needs to find the closing tag of the found nested opening tag
-                                    # You can count the opening tags and subtract the respective closing tags
-                                    number_of_nested_open_tags += 1
-                                    parsing_progression_index += closed_tag_match.end()
-                                    continue
-                            number_of_nested_open_tags -= 1
-                            closed_tag_start_index = parsing_progression_index + closed_tag_match.start()
-                            parsing_progression_index += closed_tag_match.end()
-                            closed_tag_end_index = parsing_progression_index
-
-                    cls._chunks.append(line[open_tag_start_index:open_tag_end_index])
-                    if closed_tag_match:
-                        cls.look_for_inline_hashtag_without_value(line[open_tag_end_index:closed_tag_start_index])
-                        cls._chunks.append(line[closed_tag_start_index:closed_tag_end_index])
-                    else:
-                        cls.look_for_inline_hashtag_without_value(line[open_tag_start_index:])
+                if extra_content_text:
+                    self._parsing_tree.append_id_to_tagged_piece_value(self._parent_stack[-2], child_position)
+                    self._parsing_tree.append_tagged_piece([extra_content_text, ''])
+
+    def look_for_inline_tags(self, line: str, tag_name: str = None):
+        """Look for inline tags in a text line. The pieces are only appended to the parsing tree: if the line is split
+        and a tag name is given, the parent piece is appended before its children, and it receives their IDs when
+        they are known. So every ID is the final position of its piece.
+
+        :param line: the line where to look for inline tags.
+        :param tag_name: the tag name of the parent piece of the split line, None to not append a parent piece.
+        :return: a list of IDs of the new strings found after the processing of the inline tags. If the line is not
+        split, False is returned.
+        """
+        child_ids = []
+
+        # The chunk list needs to be a new object for every sub-line
+        chunks = self.split_line_into_chunks(line).copy()
+        if len(chunks) < 2:
+            return False
+        else:
+            parent_id = self._parsing_tree.get_number_of_parsed_pieces()
+            if tag_name is not None:
+                self._parsing_tree.append_tagged_piece([], tag_name)
+
+            self._previous_parents += 1
+            i = 0
+            while i < len(chunks):
+                child_ids.append(self._parsing_tree.get_number_of_parsed_pieces())
+                if re.search('^' + Regex.open_inline_tag + '$', chunks[i]):
+                    sub_line = chunks[i + 1]
+                    child_tag_name = chunks[i][2:-2]
+                    parents_before_nesting = self._previous_parents
+                    self.evaluate_presence_of_inline_tags(sub_line, child_tag_name)
+                    self._previous_parents = parents_before_nesting
+                    i += 3
+                elif re.search('^' + Regex.hashtag_no_value + '$', chunks[i]):
+                    child_tag_name = chunks[i][1:-1]
+                    self._parsing_tree.append_tagged_piece('', child_tag_name)
+                    i += 1
+                elif re.search('^\v$', chunks[i]):
+                    self._parsing_tree.append_tagged_piece('', '_empty_line')
+                    i += 1
                 else:
-                    if parsing_progression_index < len(line):
-                        cls.look_for_inline_hashtag_without_value(line[parsing_progression_index:])
-                    break
-            return cls._chunks
+                    self._parsing_tree.append_tagged_piece(chunks[i], '')
+                    i += 1
 
-        @classmethod
-        def look_for_inline_hashtag_without_value(cls, line: str):
-            """Look for all the inline hashtags without value in a text line and add to _chunks the new substrings
-            generated by the presence of these tags.
+            if tag_name is not None:
+                self._parsing_tree.append_id_to_tagged_piece_value(parent_id, child_ids)
+            return child_ids
 
-            :param line: the text line where to look for.
-            """
-            match_hashtag_no_value = re.search(Regex.hashtag_no_value, line)
-            match_empty_line = re.search('\v', line)
+    def split_line_into_chunks(self, line: str):
+        """Split a text line in substrings according to the inline tags found and the double new line used. The
+        line is scanned once moving an offset in it, so its remaining part is never copied to be searched again.
+
+        :param line: the line where to look for inline tags.
+        :return: a list of substrings in which the line has been split.
+        """
+        self._chunks.clear()
+        line_length = len(line)
+        parsing_progression_index = 0
+        closed_tag_end_index = 0
+        next_open_tag_start_index = -1
+
+        while parsing_progression_index < line_length:
+            main_open_tag_match = self._open_inline_tag.search(line, parsing_progression_index)
 
             # If there is an escape \ before the special chars, ignore them
-            if match_hashtag_no_value:
-                if match_hashtag_no_value.start() - 1 >= 0:
-                    if line[match_hashtag_no_value.start() - 1] == '\\':
-                        match_hashtag_no_value = None
-
-            if match_hashtag_no_value and match_empty_line:
-                if match_hashtag_no_value.start() < match_empty_line.start():
-                    if match_hashtag_no_value.start() > 0:
-                        cls._chunks.append(line[0:match_hashtag_no_value.start()])
-                    cls._chunks.append(line[match_hashtag_no_value.start():match_hashtag_no_value.end()])
-                    cls.look_for_inline_hashtag_without_value(line[match_hashtag_no_value.end():])
-
-                elif match_empty_line.start() < match_hashtag_no_value.start():
-                    if match_empty_line.start() > 0:
-                        cls._chunks.append(line[0:match_empty_line.start()])
-                    cls._chunks.append(line[match_empty_line.start():match_empty_line.end()])
-                    cls.look_for_inline_hashtag_without_value(line[match_empty_line.end():])
-
-            elif match_empty_line and not match_hashtag_no_value:
-                if match_empty_line.start() > 0:
-                    cls._chunks.append(line[0:match_empty_line.start()])
-                cls._chunks.append(line[match_empty_line.start():match_empty_line.end()])
-                cls.look_for_inline_hashtag_without_value(line[match_empty_line.end():])
-
-            elif match_hashtag_no_value and not match_empty_line:
-                if match_hashtag_no_value.start() > 0:
-                    cls._chunks.append(line[0:match_hashtag_no_value.start()])
-                cls._chunks.append(line[match_hashtag_no_value.start():match_hashtag_no_value.end()])
-                cls.look_for_inline_hashtag_without_value(line[match_hashtag_no_value.end():])
+            if main_open_tag_match:
+                if main_open_tag_match.start() - 1 >= 0:
+                    if line[main_open_tag_match.start() - 1] == '\\':
+                        main_open_tag_match = None
+
+            if not main_open_tag_match:
+                self.look_for_inline_hashtag_without_value(line, closed_tag_end_index)
+                break
+
+            open_tag_start_index = main_open_tag_match.start()
+            open_tag_end_index = main_open_tag_match.end()
+            parsing_progression_index = open_tag_end_index
+
+            # Each opening tag actually includes a closing tag, so a nested opening tag found before the next
+            # closing tag is pushed on the stack and its end is skipped, while a closing tag pops the stack.
+            # The position of the next opening tag is kept until the scanning goes beyond it.
+            open_tag_stack = [open_tag_start_index]
+            closed_tag_match = None
+            while open_tag_stack:
+                closed_tag_match = self._closed_inline_tag.search(line, parsing_progression_index)
+                if not closed_tag_match:
+                    break
+
+                if next_open_tag_start_index < parsing_progression_index:
+                    nested_open_tag_match = self._open_inline_tag.search(line, parsing_progression_index)
+                    next_open_tag_start_index = nested_open_tag_match.start() if nested_open_tag_match \
+                        else line_length
+
+                if next_open_tag_start_index < closed_tag_match.start():
+                    open_tag_stack.append(next_open_tag_start_index)
+                else:
+                    open_tag_stack.pop()
+                parsing_progression_index = closed_tag_match.end()
+
+            # An opening tag without its closing tag is normal text, like an escaped opening tag
+            if not closed_tag_match:
+                self.look_for_inline_hashtag_without_value(line, closed_tag_end_index)
+                break
+
+            if closed_tag_end_index != open_tag_start_index:
+                self.look_for_inline_hashtag_without_value(line, closed_tag_end_index, open_tag_start_index)
+            self._chunks.append(line[open_tag_start_index:open_tag_end_index])
+            self.look_for_inline_hashtag_without_value(line, open_tag_end_index, closed_tag_match.start())
+            self._chunks.append(line[closed_tag_match.start():closed_tag_match.end()])
+            closed_tag_end_index = parsing_progression_index
+
+        return self._chunks
+
+    def look_for_inline_hashtag_without_value(self, line: str, start_index: int = 0, end_index: int = -1):
+        """Look for all the inline hashtags without value and the empty lines in a part of a text line and add to
+        _chunks the new substrings generated by their presence. The part of line is scanned in a single pass, so
+        there is no limit to the number of tags in a line.
+
+        :param line: the text line where to look for.
+        :param start_index: the index where the part of the line to look in starts.
+        :param end_index: the index where the part of the line to look in ends, -1 to reach the end of the line.
+        """
+        if end_index < 0:
+            end_index = len(line)
+
+        chunk_start_index = start_index
+        escaped_hashtag_found = False
+        for match in self._inline_hashtag_or_empty_line.finditer(line, start_index, end_index):
+            if match.lastindex:
+                # If there is an escape \ before the special chars, ignore them and the next hashtags until the
+                # next empty line
+                if escaped_hashtag_found:
+                    continue
+                if match.start() > chunk_start_index and line[match.start() - 1] == '\\':
+                    escaped_hashtag_found = True
+                    continue
             else:
-                if line != '':
-                    cls._chunks.append(line)
+                escaped_hashtag_found = False
+
+            if match.start() > chunk_start_index:
+                self._chunks.append(line[chunk_start_index:match.start()])
+            self._chunks.append(match.group())
+            chunk_start_index = match.end()
+
+        if chunk_start_index < end_index:
+            self._chunks.append(line[chunk_start_index:end_index])
+
+
+class Parser:
+    """It parses the tagged text syntax to produce a list of tagged strings collected in a parsing_tree model."""
 
     @classmethod
-    def parse_spine_and_all_required_files(cls, tt_spine_rel_path: str):
+    def parse_spine_and_all_required_files(
+        cls, tt_spine_rel_path: str, jobs: int = 1, streaming: bool = False, cache_format: str = 'json'
+    ):
         """Parse every required file (tt contents and templates) starting from the spine file.
 
         :param tt_spine_rel_path: the relative path of tt spine file respect to make.py
+        :param jobs: the number of processes that parse the tt files, 1 to parse them in the current process.
+        :param streaming: True to parse the tt files in the current process one top-level block at a time, so that
+        the used memory depends on the largest block instead of the whole file. It cannot be used with more jobs.
+        :param cache_format: the format of the intermediate files in the json folder, 'json' or the binary 'ttb'.
         """
-        _Reader.initialize_and_parse_spine(tt_spine_rel_path)
-        _Reader.parse_required_tagged_texts()
+        if streaming and jobs > 1:
+            raise ReaderError.StreamingWithJobsError(jobs)
+
+        try:
+            _Reader.initialize_and_parse_spine(tt_spine_rel_path, streaming, cache_format)
+            _Reader.parse_required_tagged_texts(jobs)
+        finally:
+            _Reader.stop_writing_json_files()
 
 
 class _Reader:
     """It collects methods to open the tt files and to read the raw text in order to produce a machine-readable
     structure in the memory."""
 
+    _min_size_of_segmented_file = 1 << 20  # in bytes, a smaller tt file is parsed by one process
+    _lines_per_segment = 20000
+    _streaming = False
+    _serializer = JsonSerializer
+    _json_file_writer = None  # the thread that writes the json files while the process goes on
+    _json_file_writings = []
+    _parsed_data_of_json_files = {}  # key: json file abs path; value: the parsed data kept in memory
+
     @classmethod
-    def initialize_and_parse_spine(cls, tt_spine_rel_path: str):
+    def initialize_and_parse_spine(cls, tt_spine_rel_path: str, streaming: bool = False, cache_format: str = 'json'):
         """Parse the spine file to prepare the steps of the whole process setting all the needed variables.
 
         :param tt_spine_rel_path: the relative path of tt spine file respect to make.py
+        :param streaming: True to parse the tt files in the current process one top-level block at a time, writing
+        the json files while the tt files are read.
+        :param cache_format: the format of the intermediate files in the json folder, 'json' or the binary 'ttb'.
         """
+        cls._streaming = streaming
+        cls._serializer = Serializer.get(cache_format)
+        cls._json_file_writer = ThreadPoolExecutor(max_workers=1)
+        cls._json_file_writings = []
+        cls._parsed_data_of_json_files = {}
         Templates.reset()
         TaggedTexts.reset()
 
         spine.initialize()
+        spine.paths.json_file_ext = cls._serializer.file_ext
         spine.paths.prepare_reading_starting_from_spine_path(tt_spine_rel_path)
+        spine.manifest.load(spine.paths.get_json_files_abs_folder(), TextParser.version)
         cls._parse_tt_file(os.path.basename(tt_spine_rel_path), TtType.SPINE)
         cls._parse_spine()
 
@@ -768,9 +902,7 @@ class _Reader:
                         )
 
         # Pass the json data to parsing_tree object
-        with open(spine.paths.get_current_json_file_abs_path(), encoding="utf-8") as json_file_stream:
-            parsing_tree.set_json_data(json.load(json_file_stream))
-            json_file_stream.close()
+        parsing_tree.set_json_data(cls._get_parsed_data(spine.paths.get_current_json_file_abs_path(False)))
 
         # Check if each spine tag exists in the TagManager and call the related method
         for index, definition in enumerate(parsing_tree.get_json_data()):
@@ -784,9 +916,12 @@ class _Reader:
         spine.check_validity_of_file_names()
 
     @classmethod
-    def parse_required_tagged_texts(cls):
+    def parse_required_tagged_texts(cls, jobs: int = 1):
         """Parse all the needed tt files (tt contents and templates) into json files or load them from the previous
-        up-to-date json files. Then prepare the triggers tags and the rules from the templates."""
+        up-to-date json files. Then prepare the triggers tags and the rules from the templates.
+
+        :param jobs: the number of processes that parse the tt files, 1 to parse them in the current process.
+        """
 
         # Associate each pub file name to a publication info item through an index and collect each pub file name.
         pub_info_index = 0
@@ -796,19 +931,35 @@ class _Reader:
                 spine.collect_tt_file_name(input_file_name)
             pub_info_index += 1
 
-        # Parse each tt template file.
-        for tt_file_name in Templates.get_tt_file_names():
-            tt_file_name = spine.paths.put_file_ext(tt_file_name, 'tt')
-            cls._parse_tt_file(tt_file_name, TtType.TEMPLATE)
+        if jobs > 1:
+            cls._parse_tt_files_in_parallel(jobs)
+        else:
+            # Parse each tt template file.
+            for tt_file_name in Templates.get_tt_file_names():
+                tt_file_name = spine.paths.put_file_ext(tt_file_name, 'tt')
+                cls._parse_tt_file(tt_file_name, TtType.TEMPLATE)
 
-        # Parse each tt content file.
-        for tt_file_name in spine.get_tt_content_file_names():
-            tt_file_name = spine.paths.put_file_ext(tt_file_name, 'tt')
-            cls._parse_tt_file(tt_file_name, TtType.CONTENT)
-            spine.counters.reset_counters_with_scope_file()
+            # Parse each tt content file.
+            for tt_file_name in spine.get_tt_content_file_names():
+                tt_file_name = spine.paths.put_file_ext(tt_file_name, 'tt')
+                cls._parse_tt_file(tt_file_name, TtType.CONTENT)
+                spine.counters.reset_counters_with_scope_file()
 
         cls._load_tagged_texts()
         cls._prepare_trigger_tags_and_rules_from_templates()
+        cls._parsed_data_of_json_files = {}
+
+        # The manifest is saved only when all the json files it records are written
+        cls._wait_for_json_files()
+        spine.manifest.save()
+
+    @classmethod
+    def stop_writing_json_files(cls):
+        """Stop the thread that writes the json files, after the writing of the ones already given to it."""
+
+        if cls._json_file_writer is not None:
+            cls._json_file_writer.shutdown(wait=True)
+            cls._json_file_writer = None
 
     @classmethod
     def _parse_tt_file(cls, tt_file_name: str, tt_type: TtType = TtType.CONTENT):
@@ -821,47 +972,126 @@ class _Reader:
         TaggedTexts.set_current_tt_file(tt_file_name, tt_type)
 
         try:
-            cls._parse_text_lines(tt_file_name)
-            cls._save_json_file()
+            parsed_data = cls._parse_text_lines(tt_file_name)
+            json_file_abs_path = spine.paths.get_current_json_file_abs_path(False)
+            if cls._streaming:
+                cls._serializer.save(parsed_data, json_file_abs_path)
+            else:
+                cls._keep_and_write_parsed_data(parsed_data, json_file_abs_path)
+            spine.manifest.record_json_file(os.path.basename(json_file_abs_path))
 
         except FlowException.ReadJsonStillUpToDateException:
             spine.append_unchanged_json_file(tt_file_name)
 
+    @classmethod
+    def _parse_tt_files_in_parallel(cls, jobs: int):
+        """Parse the tt files (templates and contents) which have not an up-to-date json file in a pool of processes.
+        The up-to-date check and the saving of the json files are done in the current process following the order of
+        the files, so the result does not depend on which process finishes first.
+
+        :param jobs: the number of processes that parse the tt files.
+        """
+        tt_files = [(tt_file_name, TtType.TEMPLATE) for tt_file_name in Templates.get_tt_file_names()]
+        tt_files += [(tt_file_name, TtType.CONTENT) for tt_file_name in spine.get_tt_content_file_names()]
+
+        tt_file_abs_paths = []
+        json_file_abs_paths = []
+        for tt_file_name, tt_type in tt_files:
+            tt_file_name = spine.paths.put_file_ext(tt_file_name, 'tt')
+            TaggedTexts.set_current_tt_file(tt_file_name, tt_type)
+            if cls._is_last_read_version_of_json_usable(tt_file_name, tt_type):
+                spine.append_unchanged_json_file(tt_file_name)
+            else:
+                tt_file_abs_paths.append(spine.paths.get_current_tt_file_abs_path())
+                json_file_abs_paths.append(spine.paths.get_current_json_file_abs_path(False))
+
+            if tt_type == TtType.CONTENT:
+                spine.counters.reset_counters_with_scope_file()
+
+        # The large files are split in segments, parsed separately and then merged in order
+        segment_lists = []
+        for tt_file_abs_path in tt_file_abs_paths:
+            if os.path.getsize(tt_file_abs_path) < cls._min_size_of_segmented_file:
+                segment_lists.append([])
+            else:
+                lines = cls._read_all_text_lines(tt_file_abs_path)
+                segment_ranges = TextParser.get_segment_ranges(lines, cls._lines_per_segment)
+                segment_lists.append([(lines[start:end], start) for start, end in segment_ranges])
+
+        number_of_tasks = sum(max(len(segments), 1) for segments in segment_lists)
+        if number_of_tasks < 2:
+            for tt_file_abs_path, json_file_abs_path in zip(tt_file_abs_paths, json_file_abs_paths):
+                cls._keep_and_write_parsed_data(cls._parse_tt_file_at_path(tt_file_abs_path), json_file_abs_path)
+                spine.manifest.record_json_file(os.path.basename(json_file_abs_path))
+            return
+
+        with ProcessPoolExecutor(max_workers=min(jobs, number_of_tasks)) as executor:
+            future_lists = []
+            for tt_file_abs_path, segments in zip(tt_file_abs_paths, segment_lists):
+                if segments:
+                    future_lists.append([
+                        executor.submit(cls._parse_tt_segment, tt_file_abs_path, lines, first_line_index)
+                        for lines, first_line_index in segments
+                    ])
+                else:
+                    future_lists.append([executor.submit(cls._parse_tt_file_at_path, tt_file_abs_path)])
+
+            for future_list, json_file_abs_path in zip(future_lists, json_file_abs_paths):
+                merged_tree = ParsingTree()
+                for future in future_list:
+                    merged_tree.append_parsed_data(future.result())
+                cls._keep_and_write_parsed_data(merged_tree.get_json_data(), json_file_abs_path)
+                spine.manifest.record_json_file(os.path.basename(json_file_abs_path))
+
+    @classmethod
+    def _parse_tt_file_at_path(cls, tt_file_abs_path: str):
+        """Read and parse a tt file without using the state of the spine, so that it can be done in another process.
+
+        :param tt_file_abs_path: the absolute path of the tt file.
+        :return: the parsed content as a list of tagged pieces.
+        """
+        text_parser = TextParser(tt_file_abs_path)
+        return text_parser.parse(cls._read_all_text_lines(tt_file_abs_path)).get_json_data()
+
+    @classmethod
+    def _parse_tt_segment(cls, tt_file_abs_path: str, lines: list, first_line_index: int):
+        """Parse a segment of a tt file without using the state of the spine, so that it can be done in another
+        process.
+
+        :param tt_file_abs_path: the absolute path of the tt file.
+        :param lines: the text lines of the segment.
+        :param first_line_index: the index of the first line of the segment in the tt file.
+        :return: the parsed content of the segment as a list of tagged pieces.
+        """
+        text_parser = TextParser(tt_file_abs_path, first_line_index)
+        return text_parser.parse(lines).get_json_data()
+
     @classmethod
     def _is_last_read_version_of_json_usable(cls, tt_file_name: str, tt_type: TtType = TtType.CONTENT):
         """Check if the last read json file is still a usable version, or it has to be generated again from the tt
-        content file.
+        content file. The decision is taken by the manifest of the json files, comparing the content of the sources.
 
         :param tt_file_name: the name of the tt file of which the old json eventually can be used again.
         :param tt_type: the type of the tt file.
         :return: True or False according to the possibility to use the json again avoiding generating it again.
         """
-        template_mod_date = 0
         if tt_type == TtType.TEMPLATE:
             spine.paths.set_current_tt_file_abs_path(spine.paths.get_template_file_abs_path(tt_file_name))
         else:
             spine.paths.set_current_tt_file_abs_path(spine.paths.get_tt_file_abs_path(tt_file_name))
-            if spine.a_pub_info_item_exists():
-                associated_template_list = spine.get_template_list_of_current_pub_item()
-                template_mod_date = Templates.get_latest_modification_date_from_template_name_list(
-                    associated_template_list)
 
-        json_file_name = spine.paths.put_file_ext(tt_file_name, 'json')
+        json_file_name = spine.paths.put_file_ext(tt_file_name, spine.paths.json_file_ext)
         spine.paths.set_current_json_file_abs_path(json_file_name)
         spine.append_detected_tt_file(tt_file_name)
 
-        # Load json file only if the tt source and all of its templates are older than it
+        # Load json file only if the tt source has the same content used to produce it. The parsed data depends only on
+        # the source and the parser version, the templates are applied later by the composition of the publications.
         json_file_exists = spine.paths.get_current_json_file_abs_path()
-        is_tt_source_newer = True
-        is_one_template_newer = True
-
-        if json_file_exists:
-            json_mod_date = os.path.getmtime(spine.paths.get_current_json_file_abs_path())
-            tt_mod_date = os.path.getmtime(spine.paths.get_current_tt_file_abs_path())
-            is_tt_source_newer = json_mod_date < tt_mod_date
-            is_one_template_newer = json_mod_date < template_mod_date
+        is_json_file_up_to_date = spine.manifest.is_json_file_up_to_date(
+            json_file_name, [spine.paths.get_current_tt_file_abs_path()]
+        )
 
-        if not json_file_exists or is_tt_source_newer or is_one_template_newer:
+        if not json_file_exists or not is_json_file_up_to_date:
             return False
         else:
             return True
@@ -871,71 +1101,86 @@ class _Reader:
         """Parse each text line looking for the special chars of the tt syntax and producing the parsed content.
 
         :param tt_file_name: the tt file name to parse.
+        :return: the parsed content as a list of tagged pieces, or as a generator of them in streaming mode.
         """
         if cls._is_last_read_version_of_json_usable(tt_file_name, TaggedTexts.get_current_tt_type()):
             raise FlowException.ReadJsonStillUpToDateException
 
-        cls._read_all_text_lines()
-        parsing_tree.clear_parsed_data()
-        Parser.Text.reset_cursors()
-        while Parser.Text.is_there_a_current_line():
-            if Parser.Text.is_current_line_not_empty():
-                Parser.Text.look_for_hashtag_without_value() or \
-                    Parser.Text.look_for_hashtag() or \
-                    Parser.Text.look_for_comment() or \
-                    Parser.Text.look_for_text_without_tag()
-                Parser.Text.reset_tag_context()
-            Parser.Text.next_line()
+        tt_file_abs_path = spine.paths.get_current_tt_file_abs_path()
+        if cls._streaming:
+            return TextParser.iterate_parsed_pieces(cls._iterate_text_lines(tt_file_abs_path), tt_file_abs_path)
+
+        text_parser = TextParser(tt_file_abs_path)
+        return text_parser.parse(cls._read_all_text_lines(tt_file_abs_path)).get_json_data()
 
     @classmethod
-    def _read_all_text_lines(cls):
-        """Read all the text lines from the textual tt file."""
+    def _read_all_text_lines(cls, tt_file_abs_path: str):
+        """Read all the text lines from the textual tt file.
 
-        f = open(spine.paths.get_current_tt_file_abs_path(), 'r', encoding='utf-8')
-        Parser.Text._lines = f.readlines()
+        :param tt_file_abs_path: the absolute path of the tt file.
+        :return: the list of the text lines.
+        """
+        f = open(tt_file_abs_path, 'r', encoding='utf-8')
+        lines = f.readlines()
         f.close()
+        return lines
 
     @classmethod
-    def _save_json_file(cls):
-        """Save as a json file in the permanent memory in the dedicated json folder the parsed content."""
-
-        f = open(spine.paths.get_current_json_file_abs_path(existing_file=False), 'w', encoding='utf-8')
-        f.write('[\n')
-        for index, item in enumerate(parsing_tree.get_json_data()):
-            if index > 0:
-                f.write(',\n')
-            f.write('[')
-            if isinstance(item[0], str):
-                if len(item[0]) > 0 and item[0][-1] == '\\':
-                    item[0] = item[0][:-1]
-                line_with_managed_escapes = (
-                    item[0].replace('\\', '\\\\')
-                    .replace('\n', '\\n')
-                    .replace('\v', '\\n\\n')
-                    .replace('"', '\\"')
-                )
-                f.write('"' + line_with_managed_escapes + '"')
-            else:
-                if len(item[0]) == 0:
-                    f.write('""')
-                else:
-                    item[0].sort()
-                    # When inline tags are present and nested, it's hard to assign the correct IDs, they respect the
-                    # general structure, but they need to be shifted. It's easier to do that now.
-                    if item[0][0] <= index:
-                        shift = index - item[0][0] + 1
-                        i = 0
-                        while i < len(item[0]):
-                            item[0][i] += shift
-                            i += 1
-
-                    f.write(str(item[0]))
-
-            f.write(', "' + str(item[1]) + '"')
-            f.write(']')
-
-        f.write('\n]')
-        f.close()
+    def _iterate_text_lines(cls, tt_file_abs_path: str):
+        """Read the text lines from the textual tt file one by one through the buffer of the open file.
+
+        :param tt_file_abs_path: the absolute path of the tt file.
+        :return: a generator of the text lines.
+        """
+        with open(tt_file_abs_path, 'r', encoding='utf-8') as tt_file_stream:
+            yield from tt_file_stream
+
+    @classmethod
+    def _keep_and_write_parsed_data(cls, parsed_data: list, json_file_abs_path: str):
+        """Keep in memory the parsed content normalized as it would be loaded from its json file, so it is not read
+        again, and give it to the thread that writes the json file. The tagged pieces are read-only, so they can be
+        written and used at the same time.
+
+        :param parsed_data: the parsed content as a list of tagged pieces.
+        :param json_file_abs_path: the absolute path of the json file.
+        """
+        normalized_data = TaggedPieces.from_pieces(Serializer.iterate_normalized_pieces(parsed_data))
+        normalized_data.compute_structure()
+        cls._parsed_data_of_json_files[json_file_abs_path] = normalized_data
+        cls._json_file_writings.append(
+            cls._json_file_writer.submit(cls._write_json_file, normalized_data, json_file_abs_path)
+        )
+
+    @classmethod
+    def _write_json_file(cls, normalized_data: TaggedPieces, json_file_abs_path: str):
+        """Write the json file of the parsed content and then the sidecar with its structure columns.
+
+        :param normalized_data: the normalized parsed content.
+        :param json_file_abs_path: the absolute path of the json file.
+        """
+        cls._serializer.write(normalized_data, json_file_abs_path)
+        cls._serializer.save_structure(normalized_data, json_file_abs_path)
+
+    @classmethod
+    def _wait_for_json_files(cls):
+        """Wait until the thread has written all the given json files, raising its error if a writing failed."""
+
+        for json_file_writing in cls._json_file_writings:
+            json_file_writing.result()
+
+        cls._json_file_writings = []
+
+    @classmethod
+    def _get_parsed_data(cls, json_file_abs_path: str):
+        """Get the parsed content of a tt file: from the memory if it has just been parsed, else from its json file.
+
+        :param json_file_abs_path: the absolute path of the json file.
+        :return: the parsed content as a list of tagged pieces.
+        """
+        if json_file_abs_path in cls._parsed_data_of_json_files:
+            return cls._parsed_data_of_json_files[json_file_abs_path]
+
+        return cls._serializer.load(json_file_abs_path)
 
     @classmethod
     def _load_tagged_texts(cls):
@@ -943,9 +1188,10 @@ class _Reader:
 
         for file_name in spine.get_tt_content_file_names():
             json_file_path = spine.paths.get_json_file_abs_path(file_name)
-            with open(json_file_path, encoding="utf-8") as json_file_stream:
-                TaggedTexts.put(file_name, json.load(json_file_stream))
-                json_file_stream.close()
+            tagged_pieces = TaggedPieces.from_pieces(cls._get_parsed_data(json_file_path))
+            if not tagged_pieces.has_structure():
+                cls._serializer.load_structure(tagged_pieces, json_file_path)
+            TaggedTexts.put(file_name, tagged_pieces)
 
     @classmethod
     def _prepare_trigger_tags_and_rules_from_templates(cls):
@@ -955,16 +1201,15 @@ class _Reader:
         """
         TaggedTexts.set_current_tt_type(TtType.TEMPLATE)
         for template_name in Templates.get_tt_file_names():
-            input_file_name = spine.paths.put_file_ext(template_name, 'json')
-
-            with open(spine.paths.get_json_file_abs_path(input_file_name), encoding="utf-8") as json_file_stream:
-                parsing_tree.set_json_data(json.load(json_file_stream))
-                json_file_stream.close()
+            parsing_tree.set_json_data(cls._get_parsed_data(spine.paths.get_json_file_abs_path(template_name)))
 
             Compositor.set_content_reference(spine.get_tt_content_file_names())
             Compositor.set_template_reference([template_name])
             Compositor.set_current_template_name(template_name)
-            Templates.set_rules(parsing_tree.get_json_data(), template_name)
+            # The rules are converted once here, so their structure is read like the one of the tagged texts
+            rules = TaggedPieces.from_pieces(parsing_tree.get_json_data())
+            rules.compute_structure()
+            Templates.set_rules(rules, template_name)
 
             for index, item in enumerate(parsing_tree.get_json_data()):
                 if item[1] in ['file-opening', 'file-ending']:
@@ -0,0 +1,240 @@
+"""The Serializers that save the parsed tt files in the json folder and load them again. The json format is the
+reference one, the binary format is a faster alternative for large tt files."""
+
+import gc
+import os
+import sys
+import json
+import json.encoder
+import marshal
+from abc import ABC, abstractmethod
+from array import array
+from tt.controller.exceptions import ReaderError
+
+
+class Serializer(ABC):
+    """The base of a format of the intermediate files. It normalizes the tagged pieces in the same way for every format,
+    so the loaded data does not depend on the chosen format. Each format implements the _read and _write hooks."""
+
+    cache_format = ''
+    file_ext = ''
+    structure_file_ext = 'structure'
+    _is_binary = False
+
+    @classmethod
+    def get(cls, cache_format: str):
+        """Get the serializer of a format of the intermediate files.
+
+        :param cache_format: the name of the format, as 'json' or 'ttb'.
+        :return: the serializer class.
+        """
+        for serializer in cls.__subclasses__():
+            if serializer.cache_format == cache_format:
+                return serializer
+
+        raise ReaderError.UnknownCacheFormatError(cache_format)
+
+    @classmethod
+    def save(cls, parsed_data, file_abs_path: str):
+        """Save the parsed content in an intermediate file. The tagged pieces are written one by one, so they can also
+        come from a generator.
+
+        :param parsed_data: the parsed content as a list or a generator of tagged pieces.
+        :param file_abs_path: the absolute path of the intermediate file.
+        """
+        cls.write(cls.iterate_normalized_pieces(parsed_data), file_abs_path)
+
+    @classmethod
+    def write(cls, normalized_pieces, file_abs_path: str):
+        """Write already normalized pieces in an intermediate file.
+
+        :param normalized_pieces: an iterable of normalized pieces, as the ones of iterate_normalized_pieces.
+        :param file_abs_path: the absolute path of the intermediate file.
+        """
+        # The parsed data can be a generator that raises a parsing error while the file is written: the file is
+        # replaced only when it is complete, so an incomplete file is never taken as up-to-date
+        partial_file_abs_path = file_abs_path + '.part'
+        if cls._is_binary:
+            f = open(partial_file_abs_path, 'wb')
+        else:
+            f = open(partial_file_abs_path, 'w', encoding='utf-8')
+
+        try:
+            cls._write(normalized_pieces, f)
+        except BaseException:
+            f.close()
+            os.remove(partial_file_abs_path)
+            raise
+
+        f.close()
+        os.replace(partial_file_abs_path, file_abs_path)
+
+    @classmethod
+    def load(cls, file_abs_path: str):
+        """Load the parsed content from an intermediate file.
+
+        :param file_abs_path: the absolute path of the intermediate file.
+        :return: the parsed content as a list of tagged pieces.
+        """
+        # The loaded pieces are many small lists without reference cycles: pausing the cyclic garbage collector avoids
+        # visiting all of them again at each collection triggered while they are created
+        is_gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return cls._read(file_abs_path)
+        finally:
+            if is_gc_enabled:
+                gc.enable()
+
+    @classmethod
+    @abstractmethod
+    def _read(cls, file_abs_path: str):
+        """Read the parsed content from an intermediate file.
+
+        :param file_abs_path: the absolute path of the intermediate file.
+        :return: the parsed content as a list of tagged pieces.
+        """
+
+    @classmethod
+    def save_structure(cls, tagged_pieces, file_abs_path: str):
+        """Save the structure columns of the tagged pieces in a sidecar of their intermediate file, already written.
+        The sidecar records the size and the modification time of the intermediate file, so it is used only with the
+        same version of it.
+
+        :param tagged_pieces: the tagged pieces of the intermediate file.
+        :param file_abs_path: the absolute path of the intermediate file.
+        """
+        file_stat = os.stat(file_abs_path)
+        parents, depths, subtree_ends = tagged_pieces.get_structure()
+        structure_file_abs_path = cls.get_structure_file_abs_path(file_abs_path)
+        with open(structure_file_abs_path + '.part', 'wb') as structure_file_stream:
+            marshal.dump(
+                [file_stat.st_size, file_stat.st_mtime_ns, parents.tobytes(), depths.tobytes(), subtree_ends.tobytes()],
+                structure_file_stream
+            )
+        os.replace(structure_file_abs_path + '.part', structure_file_abs_path)
+
+    @classmethod
+    def load_structure(cls, tagged_pieces, file_abs_path: str):
+        """Load the structure columns of the tagged pieces from the sidecar of their intermediate file. If the sidecar
+        is missing or it belongs to another version of the intermediate file, the structure is computed when needed.
+
+        :param tagged_pieces: the tagged pieces loaded from the intermediate file.
+        :param file_abs_path: the absolute path of the intermediate file.
+        :return: True or False if the structure has been loaded or not.
+        """
+        structure_file_abs_path = cls.get_structure_file_abs_path(file_abs_path)
+        if not os.path.isfile(structure_file_abs_path):
+            return False
+
+        try:
+            with open(structure_file_abs_path, 'rb') as structure_file_stream:
+                file_size, file_mtime_ns, *columns = marshal.loads(structure_file_stream.read())
+        except (ValueError, EOFError, TypeError):
+            return False
+
+        file_stat = os.stat(file_abs_path)
+        if [file_size, file_mtime_ns] != [file_stat.st_size, file_stat.st_mtime_ns]:
+            return False
+
+        parents, depths, subtree_ends = array('i'), array('I'), array('I')
+        for column, column_bytes in zip([parents, depths, subtree_ends], columns):
+            column.frombytes(column_bytes)
+            if len(column) != len(tagged_pieces):
+                return False
+
+        tagged_pieces.set_structure(parents, depths, subtree_ends)
+        return True
+
+    @classmethod
+    def get_structure_file_abs_path(cls, file_abs_path: str):
+        """Get the path of the sidecar with the structure columns of an intermediate file.
+
+        :param file_abs_path: the absolute path of the intermediate file.
+        :return: the absolute path of the sidecar.
+        """
+        return file_abs_path + '.' + cls.structure_file_ext
+
+    @classmethod
+    def iterate_normalized_pieces(cls, parsed_data):
+        """Normalize the tagged pieces as they are saved: the value is a text or a non-empty list of IDs, and the tag is
+        a string. The IDs are already the final positions of the pieces, as the parsing tree is built appending them.
+
+        :param parsed_data: the parsed content as a list or a generator of tagged pieces.
+        :return: a generator of the normalized pieces as (value, tag) tuples, equal to the loaded ones.
+        """
+        for item in parsed_data:
+            value = item[0]
+            if isinstance(value, str):
+                if len(value) > 0 and value[-1] == '\\':
+                    value = value[:-1]
+                value = value.replace('\v', '\n\n')
+
+            elif len(value) == 0:
+                value = ''
+
+            yield value, sys.intern(str(item[1]))
+
+    @classmethod
+    @abstractmethod
+    def _write(cls, normalized_pieces, f):
+        """Write the normalized pieces in an open intermediate file.
+
+        :param normalized_pieces: an iterable of normalized pieces.
+        :param f: the open stream of the intermediate file.
+        """
+
+
+class JsonSerializer(Serializer):
+    """The json format, one tagged piece per line. It is readable and it is the reference format of the tests."""
+
+    cache_format = 'json'
+    file_ext = 'json'
+    _pieces_per_write = 4096
+
+    @classmethod
+    def _read(cls, file_abs_path: str):
+        with open(file_abs_path, encoding='utf-8') as json_file_stream:
+            return json.load(json_file_stream)
+
+    @classmethod
+    def _write(cls, normalized_pieces, f):
+        # The pieces are joined in chunks written at once, the chunks have a limited size also when they come from a
+        # generator. The texts are escaped in one pass by the C encoder of the json module, that also escapes the
+        # control chars, so the written file is always valid json.
+        encode_string = json.encoder.encode_basestring
+        f.write('[\n')
+        separator = ''
+        chunk = []
+        for value, tag in normalized_pieces:
+            if isinstance(value, str):
+                chunk.append('[' + encode_string(value) + ', "' + tag + '"]')
+            else:
+                chunk.append('[' + str(value) + ', "' + tag + '"]')
+
+            if len(chunk) == cls._pieces_per_write:
+                f.write(separator + ',\n'.join(chunk))
+                separator = ',\n'
+                chunk = []
+
+        if chunk:
+            f.write(separator + ',\n'.join(chunk))
+        f.write('\n]')
+
+
+class MarshalSerializer(Serializer):
+    """The binary format of the marshal module. The tag names are interned, so each of them is stored once and then
+    referenced. It is loaded faster than json, but it is readable only by Python."""
+
+    cache_format = 'ttb'
+    file_ext = 'ttb'
+    _is_binary = True
+
+    @classmethod
+    def _read(cls, file_abs_path: str):
+        with open(file_abs_path, 'rb') as ttb_file_stream:
+            return marshal.loads(ttb_file_stream.read())
+
+    @classmethod
+    def _write(cls, normalized_pieces, f):
+        marshal.dump([[value, tag] for value, tag in normalized_pieces], f)
@@ -0,0 +1,62 @@
+"""The File Cache keeps in memory the text of the files included in the publications, as the ones of the from-file
+subtag, so a file used by a frequent rule is read from the disk only once."""
+
+import os
+from collections import OrderedDict
+
+
+class FileCache:
+    """The texts of the included files, shared by all the publications. Each text is valid while its file has the same
+    modification time and size. The least recently used texts are removed when the total size exceeds the limit."""
+
+    def __init__(self, max_size: int = 16 * 1024 * 1024):
+        """Instantiate an empty file cache.
+
+        :param max_size: the maximum total number of chars of the cached texts.
+        """
+        self._max_size = max_size
+        self._size = 0
+        self._entries = OrderedDict()  # key: file abs path; value: [modification time, size, text]
+
+    def reset(self):
+        """Remove all the cached texts."""
+
+        self._size = 0
+        self._entries = OrderedDict()
+
+    def get_text(self, file_path: str):
+        """Get the text of a file, reading it only if it is not cached or it has been changed.
+
+        :param file_path: the path of the file.
+        :return: the text of the file.
+        """
+        file_abs_path = os.path.abspath(file_path)
+        file_stat = os.stat(file_abs_path)
+        entry = self._entries.get(file_abs_path)
+        if entry is not None:
+            if entry[0] == file_stat.st_mtime_ns and entry[1] == file_stat.st_size:
+                self._entries.move_to_end(file_abs_path)
+                return entry[2]
+
+            self._remove(file_abs_path)
+
+        with open(file_abs_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+
+        if len(text) <= self._max_size:
+            self._entries[file_abs_path] = [file_stat.st_mtime_ns, file_stat.st_size, text]
+            self._size += len(text)
+            while self._size > self._max_size:
+                self._remove(next(iter(self._entries)))
+
+        return text
+
+    def _remove(self, file_abs_path: str):
+        """Remove the cached text of a file.
+
+        :param file_abs_path: the absolute path of the file.
+        """
+        self._size -= len(self._entries.pop(file_abs_path)[2])
+
+
+file_cache = FileCache()
@@ -0,0 +1,163 @@
+"""The Joined Content is a view of some tagged texts read as a single one, like the content list of a publication. It
+does not copy the tagged texts: each global index is mapped to a tagged text and a local index, and the child IDs are
+shifted while they are read."""
+
+from array import array
+from bisect import bisect_right
+
+
+class JoinedContent:
+    """A read-only sequence of the tagged pieces of some tagged texts, one after the other. The child IDs of each tagged
+    text are shifted by the number of the pieces before it, as if the tagged texts had been joined in a new one.
+
+    It reads like TaggedPieces, so it can be used in its place by the Compositor."""
+
+    def __init__(self, tagged_pieces_list: list):
+        """Instantiate the view of some tagged texts.
+
+        :param tagged_pieces_list: the list of the tagged pieces to join, in order.
+        """
+        self._parts = tagged_pieces_list
+        self._offsets = array('I', [0])  # the global index of the first piece of each tagged text, and the total
+        for tagged_pieces in tagged_pieces_list:
+            self._offsets.append(self._offsets[-1] + len(tagged_pieces))
+
+    def get_part_index(self, piece_id: int):
+        """Get the position of the tagged text that contains a piece, with a binary search over the offsets.
+
+        :param piece_id: the global ID of the piece.
+        :return: the position of the tagged text in the joined ones, -1 if the ID is out of range.
+        """
+        if piece_id < 0 or piece_id >= self._offsets[-1]:
+            return -1
+
+        return bisect_right(self._offsets, piece_id) - 1
+
+    def _locate(self, piece_id: int):
+        """Get the tagged text of a piece and the local ID of the piece in it.
+
+        :param piece_id: the global ID of the piece, negative to count from the end.
+        :return: a tuple with the tagged pieces, the local ID and the offset of the tagged text.
+        """
+        if piece_id < 0:
+            piece_id += self._offsets[-1]
+
+        part_index = self.get_part_index(piece_id)
+        if part_index == -1:
+            raise IndexError('joined content index out of range')
+
+        offset = self._offsets[part_index]
+        return self._parts[part_index], piece_id - offset, offset
+
+    def get_value(self, piece_id: int):
+        """Get the value of a piece: its text or the list of its global child IDs.
+
+        :param piece_id: the global ID of the piece.
+        :return: the value of the piece.
+        """
+        tagged_pieces, local_id, offset = self._locate(piece_id)
+        value = tagged_pieces.get_value(local_id)
+        if type(value) is list and offset > 0:
+            return [child_id + offset for child_id in value]
+
+        return value
+
+    def get_tag(self, piece_id: int):
+        """Get the tag name of a piece.
+
+        :param piece_id: the global ID of the piece.
+        :return: the tag name of the piece.
+        """
+        tagged_pieces, local_id, offset = self._locate(piece_id)
+        return tagged_pieces.get_tag(local_id)
+
+    def get_raw_value(self, piece_id: int):
+        """Get the raw value of a piece, as joined by its tagged text.
+
+        :param piece_id: the global ID of the piece.
+        :return: the raw value of the piece.
+        """
+        tagged_pieces, local_id, offset = self._locate(piece_id)
+        return tagged_pieces.get_raw_value(local_id)
+
+    def compute_structure(self):
+        """Compute the structure columns of every tagged text, if they are not already known."""
+
+        for tagged_pieces in self._parts:
+            tagged_pieces.compute_structure()
+
+    def get_parent(self, piece_id: int):
+        """Get the parent of a piece.
+
+        :param piece_id: the global ID of the piece.
+        :return: the global ID of the parent, -1 for a top-level piece.
+        """
+        tagged_pieces, local_id, offset = self._locate(piece_id)
+        parent_id = tagged_pieces.get_parent(local_id)
+        if parent_id < 0:
+            return -1
+
+        return parent_id + offset
+
+    def get_depth(self, piece_id: int):
+        """Get the depth of a piece in the tree of its tagged text.
+
+        :param piece_id: the global ID of the piece.
+        :return: the depth of the piece, 1 for a top-level piece.
+        """
+        tagged_pieces, local_id, offset = self._locate(piece_id)
+        return tagged_pieces.get_depth(local_id)
+
+    def get_subtree_end(self, piece_id: int):
+        """Get the last piece of the subtree of a piece.
+
+        :param piece_id: the global ID of the piece.
+        :return: the global ID of the last piece of the subtree.
+        """
+        tagged_pieces, local_id, offset = self._locate(piece_id)
+        return tagged_pieces.get_subtree_end(local_id) + offset
+
+    def find_next_piece_with_tag(self, tag_name: str, start_id: int, is_nested: bool):
+        """Find the first piece with a tag from a starting piece, among the top-level pieces or among the nested ones.
+        The search goes on in the following tagged texts.
+
+        :param tag_name: the tag name of the piece to find.
+        :param start_id: the global ID of the piece from which the search starts, included.
+        :param is_nested: True to look for a nested piece, False for a top-level piece.
+        :return: the global ID of the found piece, -1 if there is not.
+        """
+        part_index = self.get_part_index(max(start_id, 0))
+        if part_index == -1:
+            return -1
+
+        local_start_id = max(start_id, 0) - self._offsets[part_index]
+        while part_index < len(self._parts):
+            piece_id = self._parts[part_index].find_next_piece_with_tag(tag_name, local_start_id, is_nested)
+            if piece_id != -1:
+                return piece_id + self._offsets[part_index]
+
+            local_start_id = 0
+            part_index += 1
+
+        return -1
+
+    def __len__(self):
+        return self._offsets[-1]
+
+    def __getitem__(self, piece_id):
+        if isinstance(piece_id, slice):
+            return [self[i] for i in range(*piece_id.indices(len(self)))]
+
+        tagged_pieces, local_id, offset = self._locate(piece_id)
+        value, tag = tagged_pieces[local_id]
+        if type(value) is list and offset > 0:
+            value = [child_id + offset for child_id in value]
+
+        return [value, tag]
+
+    def __iter__(self):
+        for tagged_pieces, offset in zip(self._parts, self._offsets):
+            for value, tag in tagged_pieces:
+                if type(value) is list and offset > 0:
+                    value = [child_id + offset for child_id in value]
+                yield [value, tag]
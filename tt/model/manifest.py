@@ -0,0 +1,150 @@
+"""The Manifest of the intermediate json files records the content hash of the tt sources of each json file. It allows
+to recognize an up-to-date json file also when the modification times of its sources have changed, but not their
+content, like after a checkout or the restore of a cache."""
+
+import os
+import json
+import hashlib
+
+
+class Manifest:
+    """The sources of the json files of a json folder. For each json file, it keeps the modification time, the size and
+    the content hash of every tt file needed to produce it. The modification time and the size are only a fast check to
+    avoid computing again the hash of a file that has not been touched."""
+
+    file_name = '.manifest'
+
+    def __init__(self):
+        """Instantiate an empty manifest."""
+
+        self._json_files_abs_folder = ''
+        self._parser_version = 0
+        self._entries = {}  # key: json file name; value: dict with key source rel path and value signature
+        self._pending_entries = {}  # key: json file name; value: the entry to record when the json file is saved
+        self._signatures = {}  # key: source abs path; value: signature [modification time, size, hash]
+
+    def load(self, json_files_abs_folder: str, parser_version: int):
+        """Load the manifest from its file in the json folder. If it does not exist, or it was written by another
+        version of the parser, the manifest remains empty and no json file is up-to-date.
+
+        :param json_files_abs_folder: the absolute folder of the json files.
+        :param parser_version: the version of the parser that produces the json files.
+        """
+        self.__init__()
+        self._json_files_abs_folder = json_files_abs_folder
+        self._parser_version = parser_version
+
+        manifest_file_abs_path = os.path.join(json_files_abs_folder, self.file_name)
+        if not os.path.isfile(manifest_file_abs_path):
+            return
+
+        try:
+            with open(manifest_file_abs_path, encoding='utf-8') as manifest_file_stream:
+                manifest_data = json.load(manifest_file_stream)
+        except ValueError:
+            return
+
+        if isinstance(manifest_data, dict) and manifest_data.get('parser-version') == parser_version:
+            self._entries = manifest_data.get('json-files', {})
+
+    def save(self):
+        """Save the manifest in its file in the json folder. The file is replaced only when it is complete."""
+
+        manifest_file_abs_path = os.path.join(self._json_files_abs_folder, self.file_name)
+        with open(manifest_file_abs_path + '.part', 'w', encoding='utf-8') as manifest_file_stream:
+            json.dump(
+                {'parser-version': self._parser_version, 'json-files': self._entries},
+                manifest_file_stream, indent=1, sort_keys=True
+            )
+        os.replace(manifest_file_abs_path + '.part', manifest_file_abs_path)
+
+    def is_json_file_up_to_date(self, json_file_name: str, source_abs_paths: list):
+        """Check if a json file has been produced from the same content of its sources. If not, the current signatures
+        of the sources are kept, to be recorded when the json file is saved again. The old entry of the json file is
+        removed at once from the saved manifest: the json file is going to be rewritten, and if the run fails before
+        the manifest is saved again, the new json file must not be taken as produced by the old sources.
+
+        :param json_file_name: the name of the json file.
+        :param source_abs_paths: the absolute paths of the tt files needed to produce the json file.
+        :return: True or False if the json file is up-to-date or not.
+        """
+        entry = self._entries.get(json_file_name)
+        source_rel_paths = [self._get_source_rel_path(abs_path) for abs_path in source_abs_paths]
+        if entry is not None and sorted(entry) == sorted(source_rel_paths):
+            is_up_to_date = True
+            for source_abs_path, source_rel_path in zip(source_abs_paths, source_rel_paths):
+                if not self._is_source_unchanged(source_abs_path, entry, source_rel_path):
+                    is_up_to_date = False
+                    break
+
+            if is_up_to_date:
+                return True
+
+        if entry is not None:
+            del self._entries[json_file_name]
+            self.save()
+
+        self._pending_entries[json_file_name] = {
+            source_rel_path: self.get_signature(source_abs_path)
+            for source_abs_path, source_rel_path in zip(source_abs_paths, source_rel_paths)
+        }
+        return False
+
+    def record_json_file(self, json_file_name: str):
+        """Record the sources of a json file that has just been saved.
+
+        :param json_file_name: the name of the json file.
+        """
+        if json_file_name in self._pending_entries:
+            self._entries[json_file_name] = self._pending_entries.pop(json_file_name)
+
+    def get_signature(self, source_abs_path: str):
+        """Get the signature of a source file: its modification time, its size and the hash of its content. The hash is
+        computed only once for each version of the file.
+
+        :param source_abs_path: the absolute path of the source file.
+        :return: the signature as a list [modification time, size, hash].
+        """
+        file_stat = os.stat(source_abs_path)
+        signature = self._signatures.get(source_abs_path)
+        if signature is None or signature[0] != file_stat.st_mtime_ns or signature[1] != file_stat.st_size:
+            with open(source_abs_path, 'rb') as source_file_stream:
+                content_hash = hashlib.sha256(source_file_stream.read()).hexdigest()
+            signature = [file_stat.st_mtime_ns, file_stat.st_size, content_hash]
+            self._signatures[source_abs_path] = signature
+
+        return signature
+
+    def _is_source_unchanged(self, source_abs_path: str, entry: dict, source_rel_path: str):
+        """Check if a source file has the same content recorded in the manifest. If its modification time and its size
+        are the same, the file has not been touched and its hash is not computed. If only its modification time has
+        changed, the new one is recorded.
+
+        :param source_abs_path: the absolute path of the source file.
+        :param entry: the entry of the json file in the manifest.
+        :param source_rel_path: the path of the source file relative to the json folder.
+        :return: True or False if the source file is unchanged or not.
+        """
+        if not os.path.isfile(source_abs_path):
+            return False
+
+        recorded_signature = entry[source_rel_path]
+        file_stat = os.stat(source_abs_path)
+        if [file_stat.st_mtime_ns, file_stat.st_size] == recorded_signature[0:2]:
+            return True
+
+        signature = self.get_signature(source_abs_path)
+        if signature[2] != recorded_signature[2]:
+            return False
+
+        entry[source_rel_path] = signature
+        return True
+
+    def _get_source_rel_path(self, source_abs_path: str):
+        """Get the path of a source file relative to the json folder, so the manifest is still valid if the whole
+        project is moved.
+
+        :param source_abs_path: the absolute path of the source file.
+        :return: the relative path of the source file.
+        """
+        return os.path.relpath(source_abs_path, self._json_files_abs_folder)
@@ -2,32 +2,67 @@
 tagged tree structure. It is specialized to assist the process along its elaboration."""
 
 import re
+from array import array
 from tt.model.regex import Regex
+from tt.model.taggedpieces import TaggedPieces
 
 
 class ParsingTree:
     """A list of tagged pieces with a hierarchical structure like a tree. It offers the entire structured data in JSON
-    format and methods to add or get tagged pieces and other specific information."""
+    format and methods to add or get tagged pieces and other specific information.
+
+    The pieces are stored in two columns: the values, and the tags interned as small integers by TaggedPieces."""
+
+    # The special chars start with different chars, so removing their escape chars in one pass or in a pass for each
+    # of them gives the same result
+    _escaped_special_chars = re.compile(
+        r'\\(?=' + Regex.open_inline_tag + '|' + Regex.hashtag_no_value + '|' + Regex.hashtag_id + ')'
+    )
 
     def __init__(self):
-        self._parsed_data = []
+        self._values = []
+        self._tags = array('I')
+        self._json_data = None  # the pieces as [value, tag] lists, made when they are requested
+        self._tagged_pieces = None  # the json data it has been made from and the pieces as TaggedPieces
 
-    def set_json_data(self, read_data: list):
+    def set_json_data(self, read_data):
         """Set the all JSON structured data as a list of tagged pieces. Usually when a saved JSON is read from a file.
 
-        :param read_data: the JSON structured data as a list of tagged pieces.
+        :param read_data: the JSON structured data as a list or an iterable of tagged pieces.
         """
-        self._parsed_data = read_data
+        self.clear_parsed_data()
+        for value, tag in read_data:
+            self._values.append(value)
+            self._tags.append(TaggedPieces.get_tag_id(tag))
 
     def get_json_data(self):
         """Get the entire JSON structure data as a list of tagged pieces."""
 
-        return self._parsed_data
+        if self._json_data is None:
+            self._json_data = [
+                [value, TaggedPieces.get_tag_name(tag_id)] for value, tag_id in zip(self._values, self._tags)
+            ]
+
+        return self._json_data
+
+    def get_tagged_pieces(self):
+        """Get the entire JSON structure data as tagged pieces, so its structure can be read. They are made again only
+        when the pieces have been changed."""
+
+        json_data = self.get_json_data()
+        if self._tagged_pieces is None or self._tagged_pieces[0] is not json_data:
+            tagged_pieces = TaggedPieces.from_pieces(json_data)
+            tagged_pieces.compute_structure()
+            self._tagged_pieces = (json_data, tagged_pieces)
+
+        return self._tagged_pieces[1]
 
     def clear_parsed_data(self):
         """Empty the list of the tagged pieces."""
 
-        self._parsed_data.clear()
+        self._values = []
+        self._tags = array('I')
+        self._json_data = None
 
     def append_tagged_piece(self, tagged_piece, tag_name: str = None):
         """Append a tagged piece to the current parsed data. This piece is a list with two elements, the 1st is the
@@ -39,30 +74,42 @@ class ParsingTree:
         parameter.
         """
         if tag_name is None:
-            tagged_piece[0] = self.strip_escape_char_from_beginning_and_end_of_piece(tagged_piece[0])
-            tagged_piece[0] = self.strip_escape_char_from_special_chars(tagged_piece[0])
-            self._parsed_data.append(tagged_piece)
-        else:
+            tagged_piece, tag_name = tagged_piece
+
+        # Most pieces have no escape char at all, they are kept as they are
+        if type(tagged_piece) is str and '\\' in tagged_piece:
             tagged_piece = self.strip_escape_char_from_beginning_and_end_of_piece(tagged_piece)
             tagged_piece = self.strip_escape_char_from_special_chars(tagged_piece)
-            self._parsed_data.append([tagged_piece, tag_name])
+        self._values.append(tagged_piece)
+        self._tags.append(TaggedPieces.get_tag_id(tag_name))
+        self._json_data = None
 
-    def insert_parsed_piece(self, piece_position: int, tagged_piece, tag_name: str = None):
-        """Insert a tagged piece in a specific position. This piece is a list with two elements, the 1st is the tagged
-        value, and the 2nd is the tag name. The value can be a string or a list of tagged piece IDs.
+    def append_parsed_data(self, parsed_data: list):
+        """Append the tagged pieces of a following part of the same text, parsed separately from an empty tree. Their
+        piece IDs are shifted by the number of the current pieces.
 
-        :param piece_position: the index of a piece after which insert the new piece.
-        :param tagged_piece: if the 2nd parameter is omitted, it should be the list with two elements (the value and the
-        tag name). If the 2nd parameter is present, this parameter should be only the tagged value.
-        :param tag_name: the tag name of the tagged piece. Optional but if omitted, it changes the structure of the 1st
-        parameter.
+        :param parsed_data: the tagged pieces parsed separately.
         """
-        if tag_name is None:
-            tagged_piece[0] = self.strip_escape_char_from_beginning_and_end_of_piece(tagged_piece[0])
-            self._parsed_data.insert(piece_position, tagged_piece)
-        else:
-            tagged_piece = self.strip_escape_char_from_beginning_and_end_of_piece(tagged_piece)
-            self._parsed_data.insert(piece_position, [tagged_piece, tag_name])
+        shift = len(self._values)
+        for value, tag in parsed_data:
+            if type(value) is list:
+                value = [piece_id + shift for piece_id in value]
+            self._values.append(value)
+            self._tags.append(TaggedPieces.get_tag_id(tag))
+
+        self._json_data = None
+
+    def shift_piece_ids(self, shift: int):
+        """Shift all the piece IDs in the values of the tagged pieces, when the pieces are moved after other pieces.
+
+        :param shift: the number to add to each piece ID.
+        """
+        values = self._values
+        for piece_id, value in enumerate(values):
+            if type(value) is list:
+                values[piece_id] = [child_id + shift for child_id in value]
+
+        self._json_data = None
 
     def strip_escape_char_from_beginning_and_end_of_piece(self, piece: str):
         """Remove the escape char in the beginning and in the end of the piece.
@@ -96,22 +143,20 @@ class ParsingTree:
         if type(piece) is list:
             return piece
 
-        piece = re.sub(r'\\(?=' + Regex.open_inline_tag + ')', '', piece)
-        piece = re.sub(r'\\(?=' + Regex.hashtag_no_value + ')', '', piece)
-        piece = re.sub(r'\\(?=' + Regex.hashtag_id + ')', '', piece)
-        return piece
+        return self._escaped_special_chars.sub('', piece)
 
     def remove_first_piece_id_from_piece_value(self, piece_id: int):
         """Remove the first piece ID from the value of a specified piece.
 
         :param piece_id: ID of a piece of which you want to change the value.
         """
-        self._parsed_data[piece_id][0].pop(0)
+        self._values[piece_id].pop(0)
+        self._json_data = None
 
     def get_number_of_parsed_pieces(self):
         """Get the number of current parsed pieces. It corresponds to the index of the next new tagged piece."""
 
-        return len(self._parsed_data)
+        return len(self._values)
 
     def get_value_of_tagged_piece(self, piece_id: int):
         """Get value of a tagged piece using its ID from the parsed data.
@@ -119,7 +164,7 @@ class ParsingTree:
         :param piece_id: ID of the tagged piece.
         :return: value of the tagged piece.
         """
-        return self._parsed_data[piece_id][0]
+        return self._values[piece_id]
 
     def append_id_to_tagged_piece_value(self, parent_piece_id: int, child_piece_id: int | list):
         """Append an ID or a list of IDs to a value of a tagged piece. The value must be a list of piece IDs.
@@ -128,9 +173,11 @@ class ParsingTree:
         :param child_piece_id: the ID of a piece that is a child of the parent piece.
         """
         if type(child_piece_id) is list:
-            self._parsed_data[parent_piece_id][0] += child_piece_id
+            self._values[parent_piece_id] += child_piece_id
         else:
-            self._parsed_data[parent_piece_id][0].append(child_piece_id)
+            self._values[parent_piece_id].append(child_piece_id)
+
+        self._json_data = None
 
 
 parsing_tree = ParsingTree()
@@ -2,6 +2,7 @@ import os
 from enum import Enum
 from sys import path as py_path
 from tt.controller.exceptions import ReaderError
+from tt.model.manifest import Manifest
 
 
 class Spine:
@@ -110,6 +111,7 @@ class Spine:
 
         self.paths = Paths(self)
         self.counters = Counters()
+        self.manifest = Manifest()
         self._pub_info_list = []
         self._current_pub_info_item_index = 0
         self._file_name_lists = {}  # key: list name; value: file name list
@@ -390,6 +392,10 @@ class Spine:
             print('\n* The json of these files did not need to be updated.')
         else:
             print()
+
+        number_of_hits = len(self._unchanged_json_files)
+        number_of_misses = len(self._detected_tt_files) - number_of_hits
+        print(f"Json cache: {number_of_hits} hits, {number_of_misses} misses.")
         print('All tagged text files have been processed.')
 
 
@@ -414,6 +420,7 @@ class Paths:
 
         self.current_tt_file_abs_path = ''
         self.current_json_file_abs_path = ''
+        self.json_file_ext = 'json'  # the extension of the intermediate files in the json folder
 
     def get_tt_files_abs_folder(self):
         """Get the absolute folder of the tt content files."""
@@ -459,7 +466,7 @@ class Paths:
         :param file_name: the name of the json file.
         :return: the absolute path of the json file.
         """
-        file_name = self.put_file_ext(file_name, 'json')
+        file_name = self.put_file_ext(file_name, self.json_file_ext)
         return os.path.join(self.get_json_files_abs_folder(), file_name)
 
     def get_current_tt_file_abs_path(self):
@@ -0,0 +1,276 @@
+"""Tagged Pieces is the compact and read-only form of a parsed tagged text. It stores the pieces in columns instead of a
+list of [value, tag] lists, so a large tagged text uses a fraction of the memory."""
+
+from array import array
+from bisect import bisect_left
+
+
+class TaggedPieces:
+    """A read-only sequence of tagged pieces stored in columns. The tags are interned to small integers, the texts are
+    in one list and the child IDs of all the pieces are in one shared array, where each piece has a range of offsets.
+
+    Indexing a piece gives a new [value, tag] list like the ones of the json data, so the pieces can be read in the same
+    way. The value is a text or a list of child IDs."""
+
+    _tag_names = []  # the tag names interned by all the tagged pieces, the index is the tag ID
+    _tag_ids = {}  # key: tag name; value: tag ID
+
+    def __init__(self):
+        """Instantiate empty tagged pieces."""
+
+        self._tags = array('I')
+        self._texts = []  # the text of each piece, None for a piece with child IDs
+        self._child_offsets = array('I', [0])  # the children of the piece i are between offsets i and i + 1
+        self._children = array('I')
+        self._parents = None  # the parent ID of each piece, -1 for a top-level piece
+        self._depths = None  # the depth of each piece, 1 for a top-level piece
+        self._subtree_ends = None  # the ID of the last piece of the subtree of each piece
+        self._tag_positions = None  # key: (tag ID, True if nested); value: the sorted IDs of the pieces
+        self._raw_values = {}  # key: ID of a piece with child IDs; value: its raw value
+
+    @classmethod
+    def get_tag_id(cls, tag_name: str):
+        """Get the small integer that represents a tag name, interning the tag name when it is new.
+
+        :param tag_name: the tag name.
+        :return: the tag ID.
+        """
+        tag_id = cls._tag_ids.get(tag_name)
+        if tag_id is None:
+            tag_id = len(cls._tag_names)
+            cls._tag_names.append(tag_name)
+            cls._tag_ids[tag_name] = tag_id
+
+        return tag_id
+
+    @classmethod
+    def get_tag_name(cls, tag_id: int):
+        """Get the tag name represented by a tag ID.
+
+        :param tag_id: the tag ID.
+        :return: the tag name.
+        """
+        return cls._tag_names[tag_id]
+
+    @classmethod
+    def from_pieces(cls, pieces):
+        """Get the tagged pieces from the json data, or from any iterable of [value, tag] pieces.
+
+        :param pieces: an iterable of tagged pieces.
+        :return: the tagged pieces in columns.
+        """
+        if isinstance(pieces, TaggedPieces):
+            return pieces
+
+        tagged_pieces = cls()
+        for value, tag in pieces:
+            tagged_pieces._append(value, tag)
+
+        return tagged_pieces
+
+    def _append(self, value, tag: str):
+        """Append a tagged piece.
+
+        :param value: the text or the list of child IDs of the piece.
+        :param tag: the tag name of the piece.
+        """
+        self._tags.append(self.get_tag_id(tag))
+        if isinstance(value, str):
+            self._texts.append(value)
+        else:
+            self._texts.append(None)
+            self._children.extend(value)
+
+        self._child_offsets.append(len(self._children))
+        self._parents = self._depths = self._subtree_ends = None
+        self._tag_positions = None
+        self._raw_values = {}
+
+    def get_value(self, piece_id: int):
+        """Get the value of a piece: its text or the list of its child IDs.
+
+        :param piece_id: the ID of the piece.
+        :return: the value of the piece.
+        """
+        text = self._texts[piece_id]
+        if text is not None:
+            return text
+
+        return self._children[self._child_offsets[piece_id]:self._child_offsets[piece_id + 1]].tolist()
+
+    def get_tag(self, piece_id: int):
+        """Get the tag name of a piece.
+
+        :param piece_id: the ID of the piece.
+        :return: the tag name of the piece.
+        """
+        return self._tag_names[self._tags[piece_id]]
+
+    def get_raw_value(self, piece_id: int):
+        """Get the raw value of a piece: its text, or the texts of all its sub pieces joined without applying any rule.
+        The raw values of the pieces with child IDs are built once.
+
+        :param piece_id: the ID of the piece.
+        :return: the raw value of the piece.
+        """
+        text = self._texts[piece_id]
+        if text is not None:
+            return text
+
+        raw_value = self._raw_values.get(piece_id)
+        if raw_value is None:
+            child_ids = self._children[self._child_offsets[piece_id]:self._child_offsets[piece_id + 1]]
+            raw_value = ''.join([self.get_raw_value(child_id) for child_id in child_ids])
+            self._raw_values[piece_id] = raw_value
+
+        return raw_value
+
+    def compute_structure(self):
+        """Compute the parent, the depth and the end of the subtree of every piece, if they are not already known. The
+        children always come after their parent, so the parents and the depths are computed in a forward pass and the
+        subtree ends in a backward one."""
+
+        if self._parents is not None:
+            return
+
+        number_of_pieces = len(self._tags)
+        texts = self._texts
+        children = self._children
+        child_offsets = self._child_offsets
+        parents = array('i', [-1]) * number_of_pieces
+        depths = array('I', [1]) * number_of_pieces
+        subtree_ends = array('I', range(number_of_pieces))
+
+        for piece_id in range(number_of_pieces):
+            if texts[piece_id] is None:
+                child_depth = depths[piece_id] + 1
+                for child_id in children[child_offsets[piece_id]:child_offsets[piece_id + 1]]:
+                    parents[child_id] = piece_id
+                    depths[child_id] = child_depth
+
+        for piece_id in range(number_of_pieces - 1, -1, -1):
+            if texts[piece_id] is None and child_offsets[piece_id + 1] > child_offsets[piece_id]:
+                subtree_ends[piece_id] = subtree_ends[children[child_offsets[piece_id + 1] - 1]]
+
+        self._parents = parents
+        self._depths = depths
+        self._subtree_ends = subtree_ends
+
+    def get_structure(self):
+        """Get the structure columns, computing them if they are not already known.
+
+        :return: the parents, the depths and the subtree ends as arrays.
+        """
+        self.compute_structure()
+
+        return self._parents, self._depths, self._subtree_ends
+
+    def set_structure(self, parents: array, depths: array, subtree_ends: array):
+        """Set the structure columns already computed for these pieces, as the ones saved with the parsed data.
+
+        :param parents: the parent ID of each piece, -1 for a top-level piece.
+        :param depths: the depth of each piece, 1 for a top-level piece.
+        :param subtree_ends: the ID of the last piece of the subtree of each piece.
+        """
+        self._parents = parents
+        self._depths = depths
+        self._subtree_ends = subtree_ends
+
+    def has_structure(self):
+        """Check if the structure columns are already known.
+
+        :return: True or False if the structure is known or not.
+        """
+        return self._parents is not None
+
+    def get_parent(self, piece_id: int):
+        """Get the parent of a piece.
+
+        :param piece_id: the ID of the piece.
+        :return: the ID of the parent, -1 for a top-level piece.
+        """
+        self.compute_structure()
+
+        return self._parents[piece_id]
+
+    def get_depth(self, piece_id: int):
+        """Get the depth of a piece in the tree of its tagged text.
+
+        :param piece_id: the ID of the piece.
+        :return: the depth of the piece, 1 for a top-level piece.
+        """
+        self.compute_structure()
+
+        return self._depths[piece_id]
+
+    def get_subtree_end(self, piece_id: int):
+        """Get the last piece of the subtree of a piece, following the last child of each piece.
+
+        :param piece_id: the ID of the piece.
+        :return: the ID of the last piece of the subtree, the piece itself if it is a text.
+        """
+        self.compute_structure()
+
+        return self._subtree_ends[piece_id]
+
+    def find_next_piece_with_tag(self, tag_name: str, start_id: int, is_nested: bool):
+        """Find the first piece with a tag from a starting piece, among the top-level pieces or among the nested ones.
+        The IDs of the pieces with each tag are indexed once, then each search is a binary search.
+
+        :param tag_name: the tag name of the piece to find.
+        :param start_id: the ID of the piece from which the search starts, included.
+        :param is_nested: True to look for a nested piece, False for a top-level piece.
+        :return: the ID of the found piece, -1 if there is not.
+        """
+        if self._tag_positions is None:
+            self.compute_structure()
+            self._tag_positions = {}
+            for piece_id, (tag_id, parent_id) in enumerate(zip(self._tags, self._parents)):
+                key = (tag_id, parent_id >= 0)
+                if key not in self._tag_positions:
+                    self._tag_positions[key] = array('I')
+                self._tag_positions[key].append(piece_id)
+
+        positions = self._tag_positions.get((self._tag_ids.get(tag_name), is_nested))
+        if positions is None:
+            return -1
+
+        position_index = bisect_left(positions, start_id)
+        if position_index == len(positions):
+            return -1
+
+        return positions[position_index]
+
+    def __len__(self):
+        return len(self._tags)
+
+    def __getitem__(self, piece_id):
+        if isinstance(piece_id, slice):
+            return [self[i] for i in range(*piece_id.indices(len(self)))]
+
+        if piece_id < 0:
+            piece_id += len(self._tags)
+
+        return [self.get_value(piece_id), self._tag_names[self._tags[piece_id]]]
+
+    def __iter__(self):
+        tag_names = self._tag_names
+        children = self._children
+        child_offsets = self._child_offsets
+        for piece_id, (tag_id, text) in enumerate(zip(self._tags, self._texts)):
+            if text is None:
+                yield [children[child_offsets[piece_id]:child_offsets[piece_id + 1]].tolist(), tag_names[tag_id]]
+            else:
+                yield [text, tag_names[tag_id]]
+
+    def __eq__(self, other):
+        if isinstance(other, TaggedPieces):
+            return (
+                self._tags == other._tags and self._texts == other._texts and
+                self._child_offsets == other._child_offsets and self._children == other._children
+            )
+
+        try:
+            return len(self) == len(other) and all(piece == other_piece for piece, other_piece in zip(self, other))
+        except TypeError:
+            return NotImplemented
@@ -1,6 +1,7 @@
-import copy
 from enum import Enum
 from tt.model.spine import spine
+from tt.model.taggedpieces import TaggedPieces
+from tt.model.joinedcontent import JoinedContent
 
 
 class Type(Enum):
@@ -13,7 +14,8 @@ class Type(Enum):
 
 class TaggedTexts:
     """The parsed tagged texts. Each one accessible through the public methods specifying the related tt file name
-    without extension."""
+    without extension. They are stored as TaggedPieces, that read like lists of [value, tag] pieces. More tagged texts
+    are read together through a JoinedContent, that does not copy them."""
 
     _tagged_texts = {}
     _joined_tagged_texts = {}
@@ -29,32 +31,28 @@ class TaggedTexts:
 
     @classmethod
     def put(cls, tt_file_name: str, json_file_content: list):
-        """Add or rewrite the parsed content of a tagged text.
+        """Add or rewrite the parsed content of a tagged text. Its structure index (the parent, the depth and the end
+        of the subtree of each piece) is built once here, so every content piece reads it in constant time.
 
         :param tt_file_name: tt file name without extension.
-        :param json_file_content: the content of a tagged text in json format.
+        :param json_file_content: the content of a tagged text in json format, or as tagged pieces.
         """
-        cls._tagged_texts[tt_file_name] = json_file_content
+        tagged_pieces = TaggedPieces.from_pieces(json_file_content)
+        tagged_pieces.compute_structure()
+        cls._tagged_texts[tt_file_name] = tagged_pieces
 
     @classmethod
     def get(cls, tt_file_name):
         """Get the parsed content of one or more tagged texts.
 
         :param tt_file_name: tt file name without extension, even a list of tt file names.
-        :return: the content of a tagged text in json format.
+        :return: the content of a tagged text in json format, or the joined content of the listed tagged texts.
         """
         if type(tt_file_name) is list:
             if len(tt_file_name) > 1:
                 tuple_key = tuple(tt_file_name)
                 if tuple_key not in cls._joined_tagged_texts:
-                    joined_tagged_text = []
-                    i = 0
-                    while i < len(tt_file_name):
-                        reached_line_number = len(joined_tagged_text)
-                        copied_tagged_text = copy.deepcopy(cls._tagged_texts[tt_file_name[i]])
-                        joined_tagged_text += cls._increase_tagged_text_indexes(copied_tagged_text, reached_line_number)
-                        i += 1
-
+                    joined_tagged_text = JoinedContent([cls._tagged_texts[name] for name in tt_file_name])
                     cls._joined_tagged_texts[tuple_key] = joined_tagged_text
                     return joined_tagged_text
                 else:
@@ -64,24 +62,6 @@ class TaggedTexts:
         else:
             return cls._tagged_texts[tt_file_name]
 
-    @classmethod
-    def _increase_tagged_text_indexes(cls, tagged_text: list, increment: int):
-        """Increase the indexes of a tagged text with an integer number.
-
-        :param tagged_text: the tagged text to edit.
-        :param increment: an integer number to increase all the indexes.
-        :return: a tagged text increased with the requested number of indexes.
-        """
-        if increment > 0:
-            line_number = len(tagged_text)
-            for line_index in range(0, line_number):
-                if type(tagged_text[line_index][0]) is list:
-                    id_number = len(tagged_text[line_index][0])
-                    for id_index in range(0, id_number):
-                        tagged_text[line_index][0][id_index] += increment
-
-        return tagged_text
-
     @classmethod
     def get_tt_name_related_to_an_item_in_joined_tts(cls, tt_file_name_list, item_index: int):
         """Get the tt name related to an item in a list of joined tagged texts.
@@ -90,17 +70,17 @@ class TaggedTexts:
         :param item_index: the index of the item.
         :return: the name of the original tagged text before the conjunction.
         """
-        tt_lengths = []
-        farthest_reached_index = 0
-        for tt_name in tt_file_name_list:
-            farthest_reached_index += len(cls._tagged_texts[tt_name]) - 1
-            tt_lengths.append(farthest_reached_index)
+        if len(tt_file_name_list) == 1:
+            if 0 <= item_index < len(cls._tagged_texts[tt_file_name_list[0]]):
+                return tt_file_name_list[0]
+
+            return None
 
-        for file_index, farthest_index in enumerate(tt_lengths):
-            if item_index <= farthest_index:
-                return tt_file_name_list[file_index]
+        part_index = cls.get(tt_file_name_list).get_part_index(item_index)
+        if part_index == -1:
+            return None
 
-        return None
+        return tt_file_name_list[part_index]
 
     @classmethod
     def get_item_number(cls, tt_file_name: str | list):
@@ -109,15 +89,7 @@ class TaggedTexts:
         :param tt_file_name: the tt file name without extension.
         :return: the number of the items of a tagged text content.
         """
-        item_number = 0
-        if type(tt_file_name) is list:
-            i = 0
-            while i < len(tt_file_name):
-                item_number += len(cls._tagged_texts[tt_file_name[i]])
-                i += 1
-            return item_number
-        else:
-            return len(cls._tagged_texts[tt_file_name])
+        return len(cls.get(tt_file_name))
 
     @classmethod
     def get_tagged_line(cls, tt_file_name: str | list, line_index: int):
@@ -127,16 +99,8 @@ class TaggedTexts:
         :param line_index: the index of the tagged line.
         :return: the tagged line that is a list of 2 items (value and tag).
         """
-        if type(tt_file_name) is list:
-            i = 0
-            while line_index >= len(tt_file_name[i]):
-                line_index -= len(tt_file_name[i]) - 1
-                i += 1
-            actual_name = tt_file_name[i]
-        else:
-            actual_name = tt_file_name
-
-        return cls._tagged_texts[actual_name][line_index]
+        # The index of a list of tagged texts is global: the joined content finds the tagged text with a binary search
+        return cls.get(tt_file_name)[line_index]
 
     @classmethod
     def get_depth_level(cls, tt_file: str | list, index_to_check: int):
@@ -150,27 +114,34 @@ class TaggedTexts:
         if type(tt_file) is str:
             content_data = cls.get(tt_file)
 
-        current_previous_index = 0
-        level = 1
-        new_level = True
+        if index_to_check >= len(content_data):
+            return 1
 
-        while new_level:
-            new_level = False
+        # The level distinguishes only a top-level piece from a nested one, at any depth
+        return min(cls.get_tagged_pieces(content_data).get_depth(index_to_check), 2)
 
-            for piece in content_data:
-                if current_previous_index >= index_to_check:
-                    break
-                if type(piece[0]) is list:
-                    for sub_piece_index in piece[0]:
-                        if index_to_check == sub_piece_index:
-                            level += 1
-                            index_to_check = current_previous_index
-                            new_level = True
-                            break
+    @classmethod
+    def get_raw_value(cls, content_data, piece_index: int):
+        """Get the raw value of a piece using its sub pieces without applying any rule.
 
-                current_previous_index += 1
+        :param content_data: the content data as tagged pieces or as a list of pieces.
+        :param piece_index: the index of the piece in the content data.
+        :return: the string value of the piece.
+        """
+        return cls.get_tagged_pieces(content_data).get_raw_value(piece_index)
+
+    @classmethod
+    def get_tagged_pieces(cls, content_data):
+        """Get the content data as tagged pieces, so its structure can be read. The tagged texts and the rules of the
+        templates are already tagged pieces, any other list of pieces is converted each time.
+
+        :param content_data: the content data as tagged pieces, as joined content or as a list of pieces.
+        :return: the tagged pieces of the content data, or the joined content.
+        """
+        if isinstance(content_data, (TaggedPieces, JoinedContent)):
+            return content_data
 
-        return level
+        return TaggedPieces.from_pieces(content_data)
 
     @classmethod
     def get_current_tt_type(cls):
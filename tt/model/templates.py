@@ -1,4 +1,3 @@
-import os
 from tt.model.spine import spine
 
 
@@ -153,24 +152,3 @@ class Templates:
         :param rule_index: the index of the rule to apply.
         """
         cls._templates[template_name].set_trigger(tag_name, rule_index)
-
-    @classmethod
-    def get_latest_modification_date_from_template_name_list(cls, template_name_list: list = None):
-        """Get the latest modification date checking the intermediate json of a list of template names.
-
-        :param template_name_list: the list of template names to check.
-        :return: the latest modification date.
-        """
-        latest_modification_date = 0
-        if template_name_list is None:
-            template_name_list = cls.get_tt_file_names()
-
-        for template_name in template_name_list:
-            template_file_abs_path = spine.paths.get_json_file_abs_path(template_name)
-            if not os.path.isfile(template_file_abs_path):
-                return 0
-            template_modification_date = os.path.getmtime(template_file_abs_path)
-            if template_modification_date > latest_modification_date:
-                latest_modification_date = template_modification_date
-
-        return latest_modification_date